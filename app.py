@@ -1,10 +1,14 @@
 import time
 import dotenv
-import asyncio
+
+# Loaded before the imports below, the scraper modules read their settings at import time
+dotenv.load_dotenv()
+
 import logging
 import chainlit as cl
 from tools_config import tools
 from scrapers_call import scrape_and_process
+from prefetch_scheduler import start_prefetch
 from generate_blog import generate_news_blog
 from langchain_ollama import ChatOllama
 from langchain.schema import SystemMessage
@@ -14,8 +18,6 @@ from language_translate_api import translate_all_blogs_api
 from language_translate_model import translate_all_blogs_streaming
 
 
-dotenv.load_dotenv()
-
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -23,6 +25,9 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 model = ChatOllama(model="llama3.2:3b", format="json", temperature=0.3, num_ctx=1024)
 model = model.bind_tools(tools=tools)
 
+# Keep the popular feeds warm in the background while the app is running
+start_prefetch()
+
 prompt = ChatPromptTemplate.from_messages([
     SystemMessage(content="""
 You are an AI assistant. When the human asks for news, decide three buckets:
@@ -80,7 +85,7 @@ Now you respond on the user’s actual query:
 ])
 
 # Function to process user queries
-def process_query(query: str) -> str:
+async def process_query(query: str) -> str:
     """
     Processes user queries by invoking the AI model and calling appropriate functions,
     with a heuristic override for 'latest_news'.
@@ -113,9 +118,9 @@ def process_query(query: str) -> str:
                     args["latest_news"] = True
 
                 # Now call the scrapers
-                news = scrape_and_process(args, query)
-                blogs = asyncio.run(generate_news_blog(news))[:5]
-                translated_blogs = asyncio.run(translate_all_blogs_streaming(blogs, args))
+                news = await scrape_and_process(args, query)
+                blogs = (await generate_news_blog(news))[:5]
+                translated_blogs = await translate_all_blogs_streaming(blogs, args)
                 # for blog in translated_blogs:
                 #     publish_blog(blog)
                 #     time.sleep(5)
@@ -134,6 +139,6 @@ async def main(message: cl.Message):
 
     if message.content:
         query = message.content
-        response = process_query(query)
+        response = await process_query(query)
         logging.info(f"Generated Response: {response}")
         await cl.Message(content=response).send()
@@ -0,0 +1,128 @@
+"""
+Event-loop lag while many article pages are fetched and parsed at once.
+
+Serves article pages from a local server, fetches --articles of them
+concurrently and extracts each one, either inline on the event loop or
+in the parse pool. A ticker coroutine meanwhile measures how late the
+loop wakes it up, which is the delay every I/O callback sees.
+
+Saved pages under benchmarks/pages are used when present (see
+parse_benchmark --save), synthetic article pages otherwise.
+
+Usage:
+    python -m benchmarks.loop_lag_benchmark --articles 60
+    python -m benchmarks.loop_lag_benchmark --articles 100 --workers 4
+"""
+import os
+import time
+import asyncio
+import argparse
+import threading
+import statistics
+import aiohttp
+from aiohttp import web
+from scrapers import parse_pool
+from scrapers.engine import extract_article
+from benchmarks.parse_benchmark import PAGES_DIR, load_pages
+
+TICK_MS = 5
+
+SPEC = {"title_selector": "h1", "date_selector": "time", "date_attr": "datetime", "body_selector": "article p"}
+
+
+def synthetic_page(i: int, paragraphs: int = 400) -> bytes:
+    body = "".join(f"<p>Paragraph {j} of article {i}. " + "Lorem ipsum dolor sit amet. " * 8 + "</p>"
+                   for j in range(paragraphs))
+    return (f"<html><body><h1>Article {i}</h1><time datetime='2025-01-01T10:00:00'></time>"
+            f"<div class='ad'>{'<span>x</span>' * 500}</div><article>{body}</article></body></html>").encode()
+
+
+def start_server(pages: list, port: int):
+    """Serves the pages from a background thread, so serving them doesn't load the measured loop."""
+    async def handle(request):
+        return web.Response(body=pages[int(request.match_info["n"]) % len(pages)], content_type="text/html")
+
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+    async def start():
+        app = web.Application()
+        app.router.add_get("/article/{n}", handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+
+    asyncio.run_coroutine_threadsafe(start(), loop).result()
+
+
+async def measure(articles: int, port: int) -> dict:
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK_MS / 1000)
+            lags.append((time.perf_counter() - start) * 1000 - TICK_MS)
+
+    cpu = 0.0
+
+    async def fetch_and_parse(session, i):
+        nonlocal cpu
+        url = f"http://127.0.0.1:{port}/article/{i}"
+        async with session.get(url) as response:
+            html = await response.text()
+        article, seconds = await parse_pool.run_parser(extract_article, SPEC, html, url)
+        cpu += seconds
+        return article
+
+    connector = aiohttp.TCPConnector(limit=articles)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tick = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        results = await asyncio.gather(*[fetch_and_parse(session, i) for i in range(articles)])
+        wall = time.perf_counter() - start
+        done.set()
+        await tick
+
+    return {
+        "articles": sum(1 for article in results if article),
+        "wall_s": wall,
+        "parse_cpu_s": cpu,
+        "lag_mean_ms": statistics.mean(lags),
+        "lag_p95_ms": sorted(lags)[int(0.95 * (len(lags) - 1))],
+        "lag_max_ms": max(lags),
+    }
+
+
+def run_benchmark(articles: int, workers: int, port: int) -> dict:
+    saved = [html for documents in load_pages(PAGES_DIR).values() for html in documents] if os.path.isdir(PAGES_DIR) else []
+    start_server(saved or [synthetic_page(i) for i in range(20)], port)
+
+    results = {}
+    for mode, pool_size in [("inline", 0), ("pool", workers)]:
+        parse_pool.PARSE_WORKERS = pool_size
+        parse_pool.QUEUE_SIZE = 4 * max(pool_size, 1)
+        if pool_size:
+            # Spawning the workers and importing the scrapers in them is a one-off cost, keep it out of the numbers
+            asyncio.run(parse_pool.run_parser(extract_article, SPEC, synthetic_page(0, 1), "warm-up"))
+            list(parse_pool.executor().map(time.sleep, [0.1] * pool_size))
+        results[mode] = asyncio.run(measure(articles, port))
+    parse_pool.shutdown()
+    return results
+
+
+def print_report(results: dict):
+    print(f"{'mode':<8} {'articles':>8} {'wall s':>8} {'parse s':>8} {'lag mean':>9} {'lag p95':>8} {'lag max':>8}")
+    for mode, r in results.items():
+        print(f"{mode:<8} {r['articles']:>8} {r['wall_s']:>8.2f} {r['parse_cpu_s']:>8.2f} "
+              f"{r['lag_mean_ms']:>9.1f} {r['lag_p95_ms']:>8.1f} {r['lag_max_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure event-loop lag with inline vs pooled article parsing.")
+    parser.add_argument("--articles", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=max(parse_pool.PARSE_WORKERS, 1))
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+    print_report(run_benchmark(args.articles, args.workers, args.port))
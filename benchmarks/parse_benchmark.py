@@ -0,0 +1,115 @@
+"""
+Micro-benchmark for the HTML parser backends.
+
+Parses saved pages from each source with every backend and reports
+parse time and peak memory. Pages are read from <pages-dir>/<source>/*.html,
+use --save to download a page into that layout first.
+
+Usage:
+    python -m benchmarks.parse_benchmark --save ndtv https://www.ndtv.com/india
+    python -m benchmarks.parse_benchmark --pages-dir benchmarks/pages --repeat 20
+"""
+import os
+import time
+import asyncio
+import argparse
+import resource
+import statistics
+import multiprocessing
+from collections import defaultdict
+from scrapers.html_parser import BACKENDS, parse_html
+from scrapers.http_session import borrowed_session
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), "pages")
+
+
+def load_pages(pages_dir: str) -> dict:
+    """Returns {source: [html, ...]} for every saved page."""
+    pages = defaultdict(list)
+    for source in sorted(os.listdir(pages_dir)):
+        source_dir = os.path.join(pages_dir, source)
+        if not os.path.isdir(source_dir):
+            continue
+        for name in sorted(os.listdir(source_dir)):
+            if name.endswith(".html"):
+                with open(os.path.join(source_dir, name), "rb") as f:
+                    pages[source].append(f.read())
+    return dict(pages)
+
+
+def _peak_rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _run_backend(backend: str, pages: dict, repeat: int, results):
+    """Runs in a fresh process so peak memory is attributable to one backend."""
+    baseline_kb = _peak_rss_kb()
+    report = {}
+    for source, documents in pages.items():
+        timings = []
+        for _ in range(repeat):
+            for html in documents:
+                start = time.perf_counter()
+                soup = parse_html(html, backend)
+                # Same kind of work the scrapers do after parsing
+                " ".join(p.get_text(strip=True) for p in soup.select("p"))
+                timings.append(time.perf_counter() - start)
+        report[source] = {
+            "pages": len(documents),
+            "mean_ms": statistics.mean(timings) * 1000,
+            "p95_ms": sorted(timings)[int(0.95 * (len(timings) - 1))] * 1000,
+        }
+    results.put((backend, report, _peak_rss_kb() - baseline_kb))
+
+
+def run_benchmark(pages: dict, backends: list = BACKENDS, repeat: int = 10) -> dict:
+    """Returns {backend: {"sources": {...}, "peak_mem_kb": int}}."""
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    summary = {}
+    for backend in backends:
+        process = ctx.Process(target=_run_backend, args=(backend, pages, repeat, results))
+        process.start()
+        name, report, peak_kb = results.get()
+        process.join()
+        summary[name] = {"sources": report, "peak_mem_kb": peak_kb}
+    return summary
+
+
+def print_report(summary: dict):
+    print(f"{'backend':<12} {'source':<20} {'pages':>5} {'mean ms':>9} {'p95 ms':>9} {'peak MB':>8}")
+    for backend, result in summary.items():
+        for source, stats in result["sources"].items():
+            print(f"{backend:<12} {source:<20} {stats['pages']:>5} {stats['mean_ms']:>9.2f} "
+                  f"{stats['p95_ms']:>9.2f} {result['peak_mem_kb'] / 1024:>8.1f}")
+
+
+async def save_page(source: str, url: str, pages_dir: str = PAGES_DIR) -> str:
+    """Downloads a page into <pages_dir>/<source>/ for later benchmarking."""
+    source_dir = os.path.join(pages_dir, source)
+    os.makedirs(source_dir, exist_ok=True)
+    async with borrowed_session() as session:
+        async with session.get(url) as response:
+            body = await response.read()
+    path = os.path.join(source_dir, f"{len(os.listdir(source_dir)):03d}.html")
+    with open(path, "wb") as f:
+        f.write(body)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the HTML parser backends on saved pages.")
+    parser.add_argument("--pages-dir", default=PAGES_DIR)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--backends", nargs="+", default=BACKENDS, choices=BACKENDS)
+    parser.add_argument("--save", nargs=2, metavar=("SOURCE", "URL"), help="download a page instead of benchmarking")
+    args = parser.parse_args()
+
+    if args.save:
+        print("Saved", asyncio.run(save_page(args.save[0], args.save[1], args.pages_dir)))
+    else:
+        pages = load_pages(args.pages_dir)
+        if not pages:
+            print(f"No saved pages found under {args.pages_dir}, use --save SOURCE URL first.")
+        else:
+            print_report(run_benchmark(pages, args.backends, args.repeat))
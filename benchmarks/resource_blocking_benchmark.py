@@ -0,0 +1,96 @@
+"""
+Bytes transferred and navigation time per article page with and without
+the browser pool's resource blocking.
+
+Renders the same article pages in three modes: nothing blocked, only the
+heavy resource types blocked (images, stylesheets, fonts, media) and the
+default blocking, which also drops ad and analytics domains. Reports per
+article the time to domcontentloaded, which the scrapers wait for, the
+time to load, the requests made and the bytes received.
+
+Article URLs are taken from the command line, or from the index page of
+the given source.
+
+Usage:
+    python -m benchmarks.resource_blocking_benchmark --source NDTV --articles 10
+    python -m benchmarks.resource_blocking_benchmark https://www.ndtv.com/india-news/... --repeat 3
+"""
+import time
+import asyncio
+import argparse
+import statistics
+from scrapers.browser_pool import BrowserPool
+from scrapers.engine import select_links, fetch_page, resolve_targets
+from scrapers.html_parser import parse_html
+from scrapers.http_session import borrowed_session
+from scrapers.resource_blocking import BLOCKED_DOMAINS, blocking_stats
+from scrapers.registry import SPECS
+
+# Spec overrides for each mode, see resource_blocking
+MODES = {
+    "none": {"blocked_resources": [], "allowed_domains": BLOCKED_DOMAINS},
+    "resources": {"allowed_domains": BLOCKED_DOMAINS},
+    "default": {},
+}
+
+
+async def article_links(source: str, count: int) -> list:
+    spec = SPECS[source]
+    target = (await resolve_targets(spec, location=["delhi"], topics=["sports"]))[0]
+    async with borrowed_session() as session:
+        html = await fetch_page(session, target["urls"][0])
+    return select_links(spec, parse_html(html), target["urls"][0])[:count] if html else []
+
+
+async def render(pool: BrowserPool, url: str, spec: dict) -> dict:
+    """Loads one page, returns its timings, request count and bytes received."""
+    finished = []
+    async with pool.page(spec) as page:
+        page.on("requestfinished", lambda request: finished.append(asyncio.ensure_future(request.sizes())))
+        start = time.perf_counter()
+        await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        domcontentloaded = time.perf_counter() - start
+        await page.wait_for_load_state("load", timeout=60000)
+        load = time.perf_counter() - start
+        sizes = await asyncio.gather(*finished, return_exceptions=True)
+    received = sum(size["responseBodySize"] + size["responseHeadersSize"] for size in sizes if isinstance(size, dict))
+    return {"domcontentloaded_s": domcontentloaded, "load_s": load, "requests": len(finished), "bytes": received}
+
+
+async def run_benchmark(urls: list, repeat: int) -> dict:
+    results = {mode: [] for mode in MODES}
+    async with BrowserPool(max_pages=1) as pool:
+        for _ in range(repeat):
+            for url in urls:
+                # Modes take turns on every page, so they see the same site conditions
+                for mode, spec in MODES.items():
+                    try:
+                        results[mode].append(await render(pool, url, spec))
+                    except Exception as e:
+                        print(f"{mode}: failed to load {url}: {e}")
+    return results
+
+
+def print_report(results: dict):
+    print(f"{'mode':<10} {'pages':>5} {'DCL ms':>8} {'load ms':>8} {'requests':>8} {'KB':>9}")
+    for mode, runs in results.items():
+        if not runs:
+            continue
+        print(f"{mode:<10} {len(runs):>5} {statistics.median(r['domcontentloaded_s'] for r in runs) * 1000:>8.0f} "
+              f"{statistics.median(r['load_s'] for r in runs) * 1000:>8.0f} "
+              f"{statistics.mean(r['requests'] for r in runs):>8.1f} "
+              f"{statistics.mean(r['bytes'] for r in runs) / 1024:>9.1f}")
+    print(f"Blocked requests per reason: {blocking_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare article page loads with and without resource blocking.")
+    parser.add_argument("urls", nargs="*", help="article URLs, instead of --source")
+    parser.add_argument("--source", default="NDTV", help="scraper name whose index page provides the articles")
+    parser.add_argument("--articles", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    urls = args.urls or asyncio.run(article_links(args.source, args.articles))
+    print(f"Rendering {len(urls)} article pages, {args.repeat} time(s) in each mode")
+    print_report(asyncio.run(run_benchmark(urls, args.repeat)))
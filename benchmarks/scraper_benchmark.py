@@ -0,0 +1,110 @@
+"""
+End-to-end benchmark of run_selected_scrapers against a recorded HTTP archive.
+
+Record the latest, location and topic queries once against the live sites,
+then replay them from the local stand-in server as often as needed, with
+the latency and bandwidth of the link to simulate. Reports wall time,
+per-source time, bytes transferred and parse CPU for every query.
+
+Usage:
+    python -m benchmarks.scraper_benchmark --record
+    python -m benchmarks.scraper_benchmark --latency-ms 80 --bandwidth-kbps 4000 --repeat 3
+"""
+import os
+import time
+import argparse
+import tempfile
+import statistics
+
+ARCHIVE_DIR = os.path.join(os.path.dirname(__file__), "http_archive")
+
+QUERIES = {
+    "latest": {"latest_news": True},
+    "location": {"location": ["Delhi"]},
+    "topic": {"topic": ["sports", "business"]},
+}
+
+
+def configure(args):
+    """Sets the scraper settings for the run, before any scraper module reads them."""
+    os.environ["SCRAPER_HTTP_ARCHIVE"] = args.archive
+    os.environ["SCRAPER_HTTP_ARCHIVE_MODE"] = "record" if args.record else "replay"
+    os.environ["SCRAPER_REPLAY_SERVER"] = f"http://127.0.0.1:{args.port}"
+    os.environ["SCRAPER_REPLAY_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["SCRAPER_REPLAY_BANDWIDTH_KBPS"] = str(args.bandwidth_kbps)
+    # Every run goes over the (replayed) network: no HTTP cache, no stored articles, no prefetching
+    os.environ["SCRAPER_HTTP_CACHE_DIR"] = ""
+    os.environ["SCRAPER_STORE_FRESHNESS"] = "0"
+    os.environ["SCRAPER_STORE_PATH"] = os.path.join(tempfile.mkdtemp(), "benchmark.sqlite3")
+    os.environ["SCRAPER_PREFETCH"] = "0"
+
+
+def run_benchmark(queries: dict, repeat: int) -> dict:
+    """Runs every query `repeat` times, returns {query: [run report, ...]}."""
+    from chainlit.context import init_http_context
+    from scrapers.engine import parse_cpu
+    from scrapers.http_archive import default_archive
+    from scrapers_call import run_selected_scrapers, run_in_scraping_loop, last_run
+
+    async def run_query(query):
+        # Lets the progress messages be sent outside a chat session
+        init_http_context()
+        await run_selected_scrapers(query)
+
+    archive = default_archive()
+    results = {}
+    for name, query in queries.items():
+        results[name] = []
+        for _ in range(repeat):
+            cpu_before = dict(parse_cpu)
+            bytes_before = archive.counters["served_bytes"] + archive.counters["recorded_bytes"]
+            start = time.perf_counter()
+            run_in_scraping_loop(run_query(query))
+            results[name].append({
+                "wall_s": time.perf_counter() - start,
+                "articles": last_run["articles"],
+                "bytes": archive.counters["served_bytes"] + archive.counters["recorded_bytes"] - bytes_before,
+                "parse_cpu_ms": sum(parse_cpu[source] - cpu_before.get(source, 0) for source in parse_cpu) * 1000,
+                "sources": dict(last_run["sources"]),
+            })
+    return results
+
+
+def print_report(results: dict):
+    print(f"{'query':<10} {'runs':>4} {'wall s':>8} {'articles':>8} {'KB':>9} {'parse ms':>9}")
+    for name, runs in results.items():
+        print(f"{name:<10} {len(runs):>4} {statistics.mean(r['wall_s'] for r in runs):>8.2f} "
+              f"{statistics.mean(r['articles'] for r in runs):>8.1f} "
+              f"{statistics.mean(r['bytes'] for r in runs) / 1024:>9.1f} "
+              f"{statistics.mean(r['parse_cpu_ms'] for r in runs):>9.1f}")
+
+    print(f"\n{'query':<10} {'source':<24} {'seconds':>8} {'articles':>8}  outcome")
+    for name, runs in results.items():
+        for source in runs[-1]["sources"]:
+            timings = [r["sources"][source] for r in runs if source in r["sources"]]
+            print(f"{name:<10} {source:<24} {statistics.mean(t['seconds'] for t in timings):>8.2f} "
+                  f"{statistics.mean(t['articles'] for t in timings):>8.1f}  {timings[-1]['error'] or 'ok'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers against a recorded HTTP archive.")
+    parser.add_argument("--record", action="store_true", help="record the archive from the live sites instead of replaying")
+    parser.add_argument("--archive", default=ARCHIVE_DIR)
+    parser.add_argument("--queries", nargs="+", default=list(QUERIES), choices=list(QUERIES))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    parser.add_argument("--bandwidth-kbps", type=int, default=0, help="0 for unlimited")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    configure(args)
+
+    from scrapers.http_archive import ReplayServer
+    server = None if args.record else ReplayServer(port=args.port, latency_ms=args.latency_ms,
+                                                   bandwidth_kbps=args.bandwidth_kbps)
+    if server:
+        print(f"Replaying {args.archive} from {server.start()}")
+    try:
+        print_report(run_benchmark({name: QUERIES[name] for name in args.queries}, 1 if args.record else args.repeat))
+    finally:
+        if server:
+            server.stop()
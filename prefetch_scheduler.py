@@ -0,0 +1,139 @@
+"""
+Background prefetch of the feeds users ask for most:
+latest news, the News18 and Tribune cities and the topics
+offered by the query tool. Each feed is refreshed on its
+own interval into the article store, so queries for them
+are answered from warm data instead of crawling inline.
+With SCRAPER_JOB_QUEUE set the refreshes are enqueued as
+jobs and crawled by the scrape workers, not the chat app.
+"""
+import os
+import time
+import atexit
+import random
+import asyncio
+from tools_config import tools
+from scrapers.engine import stream_site
+from scrapers.http_cache import default_cache
+from scrapers.job_queue import JOB_QUEUE, default_queue, queued_stream
+from scrapers_call import ARTICLES_PER_SOURCE, SCRAPER_TIMEOUT, BROWSER_POOL, HTTP_SESSION, get_scraping_loop
+from scrapers.latest_news_scrapers import india_tv_scraper, indian_express_scraper, ndtv_scraper, mint_scraper, news18_scraper, sportskeeda
+from scrapers.location_news_scrapers import india_tv_cities_scraper, ndtv_city_scraper, news18city, tribuneindiacity
+from scrapers.topic_news_scrapers import indianexpress, livemint, news18, tribuneindia
+
+
+PREFETCH_ENABLED = os.getenv("SCRAPER_PREFETCH", "1") == "1"
+
+# Feeds refreshed at the same time, the rest wait so user queries keep most of the browser pool
+PREFETCH_CONCURRENCY = int(os.getenv("SCRAPER_PREFETCH_CONCURRENCY", "2"))
+
+# Seconds between refreshes per scraper kind, a spec's prefetch_interval overrides it.
+# Keep these below SCRAPER_STORE_FRESHNESS so warm data never goes stale between refreshes.
+PREFETCH_INTERVALS = {"latest": 300, "location": 600, "topic": 600}
+
+# Seconds between purges of expired HTTP cache entries
+CACHE_PURGE_INTERVAL = 3600
+
+# Last refresh of every feed: articles, duration and time
+prefetch_stats = {}
+
+_prefetch_future = None
+
+
+def query_topics() -> list:
+    """Topics the query tool can return."""
+    for tool in tools:
+        if tool["name"] == "analyze_news_query":
+            return tool["parameters"]["properties"]["topic"]["enum"]
+    return []
+
+
+def popular_feeds() -> list:
+    """Returns (name, spec, kwargs) for every feed kept warm."""
+    feeds = [(module.SPEC["name"], module.SPEC, {}) for module in
+             [india_tv_scraper, indian_express_scraper, ndtv_scraper, mint_scraper, news18_scraper, sportskeeda]]
+
+    for city in news18city.CITIES:
+        city = city[:-len("-news")].replace("-", " ")
+        feeds.append((f"{news18city.SPEC['name']}: {city}", news18city.SPEC, {"location": [city]}))
+    for city in tribuneindiacity.CITIES:
+        feeds.append((f"{tribuneindiacity.SPEC['name']}: {city}", tribuneindiacity.SPEC, {"location": [city]}))
+
+    # These walk the same section pages whatever the location
+    for module in [india_tv_cities_scraper, ndtv_city_scraper]:
+        feeds.append((module.SPEC["name"], module.SPEC, {"location": []}))
+
+    for topic in query_topics():
+        for module in [indianexpress, livemint, news18, tribuneindia]:
+            feeds.append((f"{module.SPEC['name']}: {topic}", module.SPEC, {"topics": [topic]}))
+
+    return feeds
+
+
+async def refresh_feed(name: str, spec: dict, kwargs: dict):
+    start = time.monotonic()
+    articles = 0
+
+    async def drain():
+        nonlocal articles
+        if JOB_QUEUE:
+            # The worker writes the articles to the shared article store, which is all a refresh is for
+            stream = queued_stream(default_queue(), spec["name"],
+                                   {"max_articles": ARTICLES_PER_SOURCE, "refresh": True, **kwargs}, timeout=SCRAPER_TIMEOUT)
+        else:
+            session = await HTTP_SESSION.get()
+            stream = stream_site(spec, ARTICLES_PER_SOURCE, session=session, pool=BROWSER_POOL, refresh=True, **kwargs)
+        async for _ in stream:
+            articles += 1
+
+    try:
+        await asyncio.wait_for(drain(), SCRAPER_TIMEOUT)
+    except Exception as e:
+        print(f"Prefetch of {name} failed: {e!r}")
+    prefetch_stats[name] = {"articles": articles, "seconds": round(time.monotonic() - start, 1), "refreshed_at": time.time()}
+
+
+async def keep_warm(name: str, spec: dict, kwargs: dict, limit: asyncio.Semaphore):
+    interval = spec.get("prefetch_interval", PREFETCH_INTERVALS[spec["kind"]])
+    # Stagger the first round so the feeds don't all start at once
+    await asyncio.sleep(random.uniform(0, min(interval, 60)))
+    while True:
+        async with limit:
+            await refresh_feed(name, spec, kwargs)
+        await asyncio.sleep(interval)
+
+
+async def purge_cache():
+    """Keeps the HTTP cache, which the refreshes keep adding to, within its age and size limits."""
+    while True:
+        try:
+            purged = await asyncio.to_thread(default_cache().purge)
+            if purged:
+                print(f"Purged {purged} HTTP cache entries")
+        except Exception as e:
+            print(f"HTTP cache purge failed: {e!r}")
+        await asyncio.sleep(CACHE_PURGE_INTERVAL)
+
+
+async def run_prefetch():
+    limit = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+    feeds = popular_feeds()
+    print(f"Prefetching {len(feeds)} feeds in the background...")
+    await asyncio.gather(purge_cache(), *[keep_warm(name, spec, kwargs, limit) for name, spec, kwargs in feeds])
+
+
+def start_prefetch():
+    """Starts the prefetch scheduler on the scraping loop, once per process."""
+    global _prefetch_future
+    if PREFETCH_ENABLED and _prefetch_future is None:
+        _prefetch_future = asyncio.run_coroutine_threadsafe(run_prefetch(), get_scraping_loop())
+
+
+def stop_prefetch():
+    global _prefetch_future
+    if _prefetch_future is not None:
+        _prefetch_future.cancel()
+        _prefetch_future = None
+
+# Registered after scrapers_call's shutdown hook, so it runs before the browser pool is closed
+atexit.register(stop_prefetch)
@@ -0,0 +1,119 @@
+"""
+Scrape worker: claims scrape jobs from the job queue, runs the scraper
+they name and publishes its articles back as they are parsed. Workers
+keep no state between jobs, so start as many as the load needs, on
+their own or next to the chat app, with SCRAPER_JOB_QUEUE=sqlite set
+for both.
+
+Usage:
+    python scrape_worker.py --concurrency 4
+"""
+import os
+import socket
+import asyncio
+import argparse
+from scrapers.engine import stream_site
+from scrapers.registry import SPECS
+from scrapers.browser_pool import BrowserPool
+from scrapers.http_session import HttpSessionManager
+from scrapers.http_cache import default_cache
+from scrapers.source_health import latency_log
+from scrapers.job_queue import POLL_INTERVAL, default_queue
+
+# Jobs run at the same time by one worker process
+WORKER_CONCURRENCY = 2
+
+# Seconds between lease renewals, which is also how fast a job cancelled by the chat process stops
+HEARTBEAT_INTERVAL = 1
+
+# Seconds between purges of old finished jobs and expired HTTP cache entries
+PURGE_INTERVAL = 600
+
+
+async def run_job(queue, job: dict, session, pool):
+    """Runs one claimed job to completion, failure or cancellation."""
+    spec = SPECS.get(job["source"])
+    if spec is None:
+        await asyncio.to_thread(queue.finish, job["id"], f"no scraper named '{job['source']}'")
+        return
+
+    published = 0
+    # Page load latencies of the job, sent back with its heartbeats for the chat process's adaptive timeouts
+    latencies = []
+
+    async def drain():
+        nonlocal published
+        latency_log.set(latencies)
+        async for article in stream_site(spec, session=session, pool=pool, **job["kwargs"]):
+            await asyncio.to_thread(queue.publish, job["id"], article)
+            published += 1
+            if job["limit"] and published >= job["limit"]:
+                break
+
+    task = asyncio.create_task(asyncio.wait_for(drain(), job["timeout"]))
+    # Renews the lease while the job runs and stops it once the chat process lost interest
+    cancelled = False
+    while not task.done():
+        await asyncio.wait([task], timeout=HEARTBEAT_INTERVAL)
+        if not task.done() and not await asyncio.to_thread(queue.heartbeat, job["id"], list(latencies)):
+            cancelled = True
+            task.cancel()
+
+    try:
+        await task
+    except asyncio.CancelledError:
+        if not cancelled:
+            raise
+        print(f"Job {job['id']} ({job['source']}) cancelled after {published} articles")
+        return
+    except asyncio.TimeoutError:
+        # The chat process applies the same timeout and reports it, the articles so far still count
+        print(f"Job {job['id']} ({job['source']}) timed out after {published} articles")
+    except Exception as e:
+        print(f"Job {job['id']} ({job['source']}) failed after {published} articles: {e!r}")
+        await asyncio.to_thread(queue.finish, job["id"], repr(e), list(latencies))
+        return
+    await asyncio.to_thread(queue.finish, job["id"], None, list(latencies))
+    print(f"Job {job['id']} ({job['source']}) done, {published} articles")
+
+
+async def work(name: str, queue, session_manager: HttpSessionManager, pool: BrowserPool):
+    """Claims and runs jobs one after another, polling while the queue is empty."""
+    while True:
+        job = await asyncio.to_thread(queue.claim, name)
+        if job is None:
+            await asyncio.sleep(POLL_INTERVAL)
+            continue
+        await run_job(queue, job, await session_manager.get(), pool)
+
+
+async def purge_old_jobs(queue):
+    while True:
+        await asyncio.to_thread(queue.purge)
+        await asyncio.to_thread(default_cache().purge)
+        await asyncio.sleep(PURGE_INTERVAL)
+
+
+async def run_worker(concurrency: int = WORKER_CONCURRENCY):
+    queue = default_queue()
+    pool = BrowserPool()
+    session_manager = HttpSessionManager()
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    print(f"Scrape worker {worker} running {concurrency} jobs at a time from {type(queue).__name__}")
+    try:
+        await asyncio.gather(purge_old_jobs(queue),
+                             *[work(f"{worker}/{i}", queue, session_manager, pool) for i in range(concurrency)])
+    finally:
+        await session_manager.close()
+        await pool.close()
+        print(f"Browser pool stats at shutdown: {pool.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run scrape jobs from the job queue.")
+    parser.add_argument("--concurrency", type=int, default=WORKER_CONCURRENCY, help="jobs run at the same time")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run_worker(args.concurrency))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,181 @@
+"""
+Embedded SQLite store for scraped articles.
+
+Articles are keyed by canonical URL and stored with their source, title,
+parsed date, body, content hash and fetch time. The engine looks an
+article up before fetching it and writes it back after parsing, so repeat
+queries within the freshness window are answered without network I/O.
+The article links found on each index page are stored the same way.
+
+Queries are single-row lookups on a local file, cheap enough to run
+directly on the scraping loop.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+STORE_PATH = os.getenv("SCRAPER_STORE_PATH", "news_store.sqlite3")
+
+# Seconds a stored article or index listing is served without refetching, 0 disables lookups
+FRESHNESS_SECONDS = int(os.getenv("SCRAPER_STORE_FRESHNESS", "900"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    title TEXT,
+    date_time TEXT,
+    body TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_fetched_at ON articles (fetched_at);
+CREATE TABLE IF NOT EXISTS listings (
+    key TEXT PRIMARY KEY,
+    links TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid", "ref", "ref_src",
+                   "ref_url", "cmpid", "ico", "_ga", "amp", "outputtype"}
+
+
+def _is_tracking(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(("utm_", "at_", "pk_"))
+
+
+def _on_host(host: str, domain: str) -> bool:
+    return host == domain or host.endswith("." + domain)
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalizes an article URL so that its variants share one key: lower-cased scheme
+    and host, no fragment, no tracking parameters, the rest sorted, and the AMP page
+    mapped to the regular one (amp. hosts, NDTV's /amp/1 suffix, News18's /amp/ segment).
+    Only used as a key, the scrapers still fetch the URL they found.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("amp."):
+        host = host[len("amp."):]
+
+    # AMP path patterns are per site, elsewhere "amp" may well be part of a real article slug
+    segments = parts.path.split("/")
+    if _on_host(host, "ndtv.com") and segments[-2:] == ["amp", "1"]:
+        segments = segments[:-2]
+    if _on_host(host, "news18.com"):
+        segments = [segment for segment in segments if segment.lower() != "amp"]
+    path = "/".join(segments) or "/"
+
+    query = sorted(pair for pair in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(pair[0]))
+    return urlunsplit((parts.scheme.lower(), host, path, urlencode(query), ""))
+
+
+def content_hash(body: str) -> str:
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def _load_date(value: str):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return value
+
+
+class ArticleStore:
+    """SQLite-backed article store, safe to share between threads."""
+
+    def __init__(self, path: str = STORE_PATH, freshness: int = FRESHNESS_SECONDS):
+        self.path = path
+        self.freshness = freshness
+        self.counters = {"hits": 0, "misses": 0, "writes": 0, "unchanged": 0}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def _is_fresh(self, fetched_at: float, max_age: int) -> bool:
+        return time.time() - fetched_at <= max_age
+
+    def get(self, url: str, max_age: int = None) -> dict:
+        """Returns the stored article for `url` if it was fetched within `max_age` seconds, else None."""
+        max_age = self.freshness if max_age is None else max_age
+        if max_age <= 0:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT title, date_time, body, fetched_at FROM articles WHERE url = ?", (canonical_url(url),)
+            ).fetchone()
+        if not row or not self._is_fresh(row[3], max_age):
+            self.counters["misses"] += 1
+            return None
+        self.counters["hits"] += 1
+        return {"title": row[0], "date_time": _load_date(row[1]), "content": row[2]}
+
+    def put(self, url: str, source: str, article: dict):
+        """Writes a parsed article back. An unchanged body only refreshes fetched_at."""
+        body = article["content"]
+        digest = content_hash(body)
+        date_time = article.get("date_time")
+        with self._lock:
+            row = self._db.execute("SELECT content_hash FROM articles WHERE url = ?", (canonical_url(url),)).fetchone()
+            if row and row[0] == digest:
+                self._db.execute("UPDATE articles SET fetched_at = ? WHERE url = ?", (time.time(), canonical_url(url)))
+                self.counters["unchanged"] += 1
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO articles (url, source, title, date_time, body, content_hash, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (canonical_url(url), source, article.get("title"), str(date_time) if date_time is not None else None,
+                 body, digest, time.time()),
+            )
+            self.counters["writes"] += 1
+
+    def get_links(self, key: str, max_age: int = None) -> list:
+        """Returns the stored [link, location] pairs of an index listing if still fresh, else None."""
+        max_age = self.freshness if max_age is None else max_age
+        if max_age <= 0:
+            return None
+        with self._lock:
+            row = self._db.execute("SELECT links, fetched_at FROM listings WHERE key = ?", (key,)).fetchone()
+        if not row or not self._is_fresh(row[1], max_age):
+            return None
+        return [tuple(pair) for pair in json.loads(row[0])]
+
+    def put_links(self, key: str, links: list):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO listings (key, links, fetched_at) VALUES (?, ?, ?)",
+                (key, json.dumps(links), time.time()),
+            )
+
+    def stats(self) -> dict:
+        return dict(self.counters)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def default_store() -> ArticleStore:
+    """Returns the process-wide article store, opened on first use."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ArticleStore()
+    return _default_store
@@ -0,0 +1,134 @@
+"""
+Process-wide Playwright browser pool shared by
+all the browser based scrapers.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright
+from scrapers.http_archive import install_browser_hooks
+from scrapers.resource_blocking import blocking_policy, install_blocking
+
+# Maximum number of tabs leased out at the same time
+MAX_PAGES = 8
+
+
+class BrowserPool:
+    """Keeps a single headless Chromium alive and leases tabs out of it."""
+
+    def __init__(self, max_pages: int = MAX_PAGES, headless: bool = True):
+        self.max_pages = max_pages
+        self.headless = headless
+        self._playwright = None
+        self._browser = None
+        # One context per resource blocking policy, see resource_blocking
+        self._contexts = {}
+        self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(max_pages)
+        self._open_pages = set()
+        self.counters = {
+            "browser_launches": 0,
+            "pages_leased": 0,
+            "pages_returned": 0,
+            "pages_leaked": 0,
+            "peak_in_use": 0,
+        }
+
+    @property
+    def in_use(self) -> int:
+        return len(self._open_pages)
+
+    def stats(self) -> dict:
+        """Returns a snapshot of the pool counters, including leak counters."""
+        return {**self.counters, "in_use": self.in_use}
+
+    async def _ensure_browser(self):
+        async with self._lock:
+            if self._browser and self._browser.is_connected():
+                return
+
+            if self._browser:
+                print("Browser pool: browser disconnected, relaunching...")
+                self._browser = None
+                self._contexts = {}
+
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self.counters["browser_launches"] += 1
+
+    async def _ensure_context(self, policy: tuple):
+        """Returns the context of a blocking policy, created with its routes before any page opens."""
+        await self._ensure_browser()
+        async with self._lock:
+            if policy not in self._contexts:
+                context = await self._browser.new_context()
+                await install_browser_hooks(context)
+                # Registered last so it runs first, handing allowed requests on to the archive hooks
+                await install_blocking(context, policy)
+                self._contexts[policy] = context
+            return self._contexts[policy]
+
+    @asynccontextmanager
+    async def page(self, spec: dict = None):
+        """
+        Leases a tab from the shared browser, with the resource blocking of `spec`,
+        or the default blocking without one. The tab is always returned on exit.
+        """
+        async with self._slots:
+            context = await self._ensure_context(blocking_policy(spec))
+            page = await context.new_page()
+            self._open_pages.add(page)
+            self.counters["pages_leased"] += 1
+            self.counters["peak_in_use"] = max(self.counters["peak_in_use"], self.in_use)
+            try:
+                yield page
+            finally:
+                await self._return_page(page)
+
+    async def _return_page(self, page):
+        self._open_pages.discard(page)
+        try:
+            if not page.is_closed():
+                await page.close()
+            self.counters["pages_returned"] += 1
+        except Exception as e:
+            print(f"Browser pool: failed to close page: {e}")
+            self.counters["pages_leaked"] += 1
+
+    async def close(self):
+        """Closes the shared browser. Tabs still leased at this point are counted as leaked."""
+        async with self._lock:
+            if self._open_pages:
+                print(f"Browser pool: {len(self._open_pages)} tab(s) still leased at shutdown")
+                self.counters["pages_leaked"] += len(self._open_pages)
+                self._open_pages.clear()
+
+            if self._browser:
+                try:
+                    await self._browser.close()
+                except Exception as e:
+                    print(f"Browser pool: error closing browser: {e}")
+            if self._playwright:
+                await self._playwright.stop()
+
+            self._browser = None
+            self._contexts = {}
+            self._playwright = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+@asynccontextmanager
+async def borrowed(pool: BrowserPool = None):
+    """Yields the given pool, or a short-lived one that is closed on exit when none is given."""
+    if pool is not None:
+        yield pool
+        return
+
+    async with BrowserPool() as own_pool:
+        yield own_pool
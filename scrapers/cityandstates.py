@@ -1,28 +1,38 @@
-import requests
+import asyncio
+import aiohttp
 import pandas as pd
-from bs4 import BeautifulSoup
+from scrapers.html_parser import parse_html
+from scrapers.http_session import borrowed_session
 
-url = "https://www.britannica.com/topic/list-of-cities-and-towns-in-India-2033033"
-response = requests.get(url)
+URL = "https://www.britannica.com/topic/list-of-cities-and-towns-in-India-2033033"
 
-# Parse the HTML content of the webpage
-soup = BeautifulSoup(response.content, 'html.parser')
+async def fetch_cities_and_states(url: str = URL, session: aiohttp.ClientSession = None) -> pd.DataFrame:
+    async with borrowed_session(session) as session:
+        async with session.get(url) as response:
+            content = await response.read()
 
-data = []
+    # Parse the HTML content of the webpage
+    soup = parse_html(content)
 
-# Find all sections with data-level="1"
-sections = soup.find_all('section', {'data-level': '1'}, id=lambda x: x and x.startswith("ref328"))
+    data = []
 
-for section in sections:
-    state_name = section.find('h2', class_='h1').get_text(strip=True)
-    cities = [li.get_text(strip=True) for li in section.find_all('li')]
-    
-    # Append each city with its corresponding state
-    for city in cities:
-        data.append([state_name, city])  # Each row is [state, city]
+    # Find all sections with data-level="1"
+    sections = soup.find_all('section', {'data-level': '1'}, id=lambda x: x and x.startswith("ref328"))
 
-# Create a DataFrame
-df = pd.DataFrame(data, columns=['State', 'City'])
+    for section in sections:
+        state_name = section.find('h2', class_='h1').get_text(strip=True)
+        cities = [li.get_text(strip=True) for li in section.find_all('li')]
+        
+        # Append each city with its corresponding state
+        for city in cities:
+            data.append([state_name, city])  # Each row is [state, city]
 
-# Save to CSV if needed
-df.to_csv("indian_cities_and_states.csv", index=False)
\ No newline at end of file
+    # Create a DataFrame
+    return pd.DataFrame(data, columns=['State', 'City'])
+
+
+if __name__ == "__main__":
+    df = asyncio.run(fetch_cities_and_states())
+
+    # Save to CSV if needed
+    df.to_csv("indian_cities_and_states.csv", index=False)
@@ -0,0 +1,434 @@
+"""
+Generic scraping engine driven by per-site specs.
+
+Every scraper module describes its site with a spec dict and calls
+`scrape_site`, or `stream_site` to receive articles as they arrive.
+The engine fetches the index page(s) or feeds, collects article links, fetches
+the articles concurrently and extracts title, date and body with the
+spec's selectors.
+
+Spec keys:
+    name              source name used in logs and metrics
+    kind              "latest", "location" or "topic"
+    index_url         index URL, or list of URLs. Topic specs use a "{topic}"
+                      placeholder that is filled with the topic slug
+    discovery         "page" (default) to collect links from the index pages, or "feed"
+                      to read them from feed_url and fall back to the index pages
+                      when the feeds yield nothing
+    feed_url          RSS, Atom or (news) sitemap URL, or list of URLs. Topic specs map
+                      topics to feed URLs, topics without one use page discovery
+    render            True when the index page needs a browser
+    index_actions     browser actions run on the index page before reading it:
+                      ("click", sel), ("fill", sel, value), ("press", sel, key),
+                      ("wait_for", sel) or ("wait", ms). Values may use "{topic}"
+    sections          callable(soup, url) -> [(section_url, location)], for sites whose
+                      index only links to section pages that carry the articles
+    resolve_location  callable(index_url, location, session) -> [target], or a coroutine
+                      function for sites whose locations must be looked up, location specs only
+    link_selector     CSS selector for article links, or callable(soup) -> [href]
+    link_filter       optional callable(link) -> bool
+    title_selector    CSS selector for the headline
+    date_selector     CSS selector for the date element
+    date_attr         attribute holding the date, the element text is used otherwise
+    date_index        which of the matched date elements to use (default 0)
+    date_strip        substrings removed from the date before parsing
+    date_format       strptime format, or "iso" (default)
+    date_parser       callable(raw) -> datetime, replaces date_strip/date_format
+    body_selector     CSS selector for the body paragraphs
+    body_join         separator between paragraphs (default " ")
+    body_strip        get_text(strip=True) on each paragraph (default False)
+    location_from_link  optional callable(link) -> location label
+    browser_fallback  render articles in a browser when the static HTML extraction is empty
+    timeout           upper bound in seconds for one HTTP page load (default 30)
+    render_timeout    upper bound in milliseconds for one browser navigation (default 20000)
+    cache_ttl         seconds HTTP responses are served from the HTTP cache without
+                      revalidation, for sources that send no ETag / Last-Modified
+    prefetch_interval seconds between background refreshes, overriding the default for its kind
+    blocked_resources, blocked_domains, allowed_domains
+                      resource blocking of the browser pages, see resource_blocking
+"""
+import os
+import time
+import asyncio
+import inspect
+from collections import defaultdict
+from datetime import datetime
+from urllib.parse import urljoin
+from scrapers.html_parser import parse_html
+from scrapers.feeds import feed_links
+from scrapers.parse_pool import run_parser
+from scrapers.snapshots import save_snapshot
+from scrapers.browser_pool import borrowed
+from scrapers.http_session import borrowed_session
+from scrapers.fetch import stream_articles, merge_streams, single_flight, fetch_two_tier, article_counts
+from scrapers.article_store import default_store, canonical_url
+from scrapers.http_cache import default_cache
+from scrapers.rate_limit import goto
+from scrapers.source_health import page_timeout, record_latency
+from scrapers.selector_health import drifted, probe_due, missing_selectors, record_selectors
+
+# Article pages fetched beyond the quota, to absorb pages that fail or come back empty
+OVERFETCH_MARGIN = int(os.getenv("SCRAPER_OVERFETCH_MARGIN", "1"))
+
+# Page timeouts in seconds while a source has no latency history, see source_health
+HTTP_TIMEOUT = 30
+RENDER_TIMEOUT = 20
+SELECTOR_TIMEOUT = 10
+
+# Spec keys that change what an article page parses to. Specs agreeing on all of them
+# share in-flight fetches of the same link, whichever timeouts they use.
+EXTRACTION_KEYS = ["title_selector", "date_selector", "date_attr", "date_index", "date_strip", "date_format",
+                   "date_parser", "body_selector", "body_join", "body_strip", "browser_fallback"]
+
+# Per-source CPU seconds spent parsing article pages, in the parse pool or on the loop
+parse_cpu = defaultdict(float)
+
+NO_DATE = "No date found"
+NO_TITLE = "No title found"
+
+
+def topic_slug(topic: str) -> str:
+    return topic.lower().replace(" ", "-")
+
+
+def parse_date(spec: dict, raw: str):
+    """Parses a raw date string with the spec's rules. Unparseable dates are returned as text."""
+    if not raw:
+        return NO_DATE
+    raw = raw.strip()
+    try:
+        if "date_parser" in spec:
+            return spec["date_parser"](raw)
+        for token in spec.get("date_strip", []):
+            raw = raw.replace(token, "")
+        raw = raw.strip()
+        date_format = spec.get("date_format", "iso")
+        if date_format == "iso":
+            date_time = datetime.fromisoformat(raw)
+        else:
+            date_time = datetime.strptime(raw, date_format)
+        return date_time.replace(tzinfo=None)
+    except ValueError:
+        return raw
+
+
+def extract_article(spec: dict, html: str, link: str) -> dict:
+    """Extracts title, date and body from an article page, returns None when the body is empty."""
+    soup = parse_html(html)
+
+    paragraphs = soup.select(spec["body_selector"])
+    texts = [p.get_text(strip=spec.get("body_strip", False)) for p in paragraphs]
+    content = spec.get("body_join", " ").join(texts)
+    if not content.strip():
+        return None
+
+    title_elem = soup.select_one(spec["title_selector"])
+    title = title_elem.get_text().strip() if title_elem else NO_TITLE
+
+    date_time = NO_DATE
+    if spec.get("date_selector"):
+        date_elems = soup.select(spec["date_selector"])
+        date_index = spec.get("date_index", 0)
+        if len(date_elems) > date_index:
+            date_elem = date_elems[date_index]
+            raw = date_elem.get(spec["date_attr"]) if spec.get("date_attr") else date_elem.get_text(strip=True)
+            date_time = parse_date(spec, raw)
+
+    return {"title": title, "date_time": date_time, "content": content}
+
+
+def extraction_key(spec: dict) -> tuple:
+    """The spec settings that decide how an article page is fetched and parsed."""
+    return tuple(repr(spec.get(key)) for key in EXTRACTION_KEYS)
+
+
+def select_links(spec: dict, soup, base_url: str) -> list:
+    """Returns the article links on an index page in page order, one per canonical URL."""
+    selector = spec["link_selector"]
+    if callable(selector):
+        hrefs = selector(soup)
+    else:
+        hrefs = [a.get("href") for a in soup.select(selector)]
+
+    links = [urljoin(base_url, href) for href in hrefs if href]
+    if spec.get("link_filter"):
+        links = [link for link in links if spec["link_filter"](link)]
+    return [link for link, _ in unique_links((link, None) for link in links)]
+
+
+def unique_links(links) -> list:
+    """Drops (link, location) pairs whose link is a variant of an earlier one, keeping the URL as found."""
+    unique = {}
+    for link, location in links:
+        unique.setdefault(canonical_url(link), (link, location))
+    return list(unique.values())
+
+
+async def resolve_targets(spec: dict, index_url=None, location: list = None, topics: list = None,
+                          session=None) -> list:
+    """
+    Expands a query into the index pages to scrape. Each target is a dict with
+    the index "urls", and the "location" or "topic" its articles belong to.
+    """
+    index_url = index_url or spec["index_url"]
+    urls = index_url if isinstance(index_url, list) else [index_url]
+
+    if spec["kind"] == "topic":
+        return [
+            {"urls": [url.replace("{topic}", topic_slug(topic)) for url in urls], "topic": topic}
+            for topic in topics or []
+        ]
+
+    if spec["kind"] == "location" and "resolve_location" in spec:
+        targets = spec["resolve_location"](index_url, location, session)
+        return await targets if inspect.isawaitable(targets) else targets
+
+    return [{"urls": urls}]
+
+
+async def fetch_page(session, url: str, timeout=None, ttl: int = None) -> str:
+    """GETs a page through the HTTP cache, returns None on a non-200 response."""
+    status, html = await default_cache().get(session, url, timeout=timeout, ttl=ttl)
+    if status != 200:
+        print(f"Failed to retrieve page {url}, status code: {status}")
+    return html
+
+
+async def fetch_source_page(spec: dict, session, url: str) -> str:
+    """`fetch_page` with a timeout adapted to the source's latency, recording how long it took."""
+    timeout = page_timeout(spec["name"], spec.get("timeout") or HTTP_TIMEOUT)
+    start = time.monotonic()
+    html = await fetch_page(session, url, timeout, spec.get("cache_ttl"))
+    record_latency(spec["name"], time.monotonic() - start)
+    return html
+
+
+def render_timeout_ms(spec: dict) -> float:
+    return page_timeout(spec["name"], spec.get("render_timeout", RENDER_TIMEOUT * 1000) / 1000) * 1000
+
+
+async def wait_for_selector(spec: dict, page, selector: str):
+    """
+    Waits for `selector` on an index page. One DOM check first, which is all a page that
+    already has it costs, and a source whose selectors keep missing fails right away,
+    apart from a full wait every PROBE_INTERVAL that lets it recover.
+    """
+    missing = await missing_selectors(page, [selector])
+    if missing and drifted(spec["name"]) and not probe_due(spec["name"]):
+        record_selectors(spec["name"], missing)
+        raise LookupError(f"'{selector}' not on {page.url}, skipping the wait as {spec['name']} selectors keep missing")
+    if missing:
+        try:
+            await page.wait_for_selector(selector, timeout=page_timeout(spec["name"], SELECTOR_TIMEOUT) * 1000)
+        except Exception:
+            record_selectors(spec["name"], missing)
+            raise
+    record_selectors(spec["name"], [])
+
+
+async def load_index(spec: dict, url: str, target: dict, session, pool) -> str:
+    """Returns the HTML of an index page, rendered in a browser tab when the spec requires it."""
+    if not spec.get("render"):
+        return await fetch_source_page(spec, session, url)
+
+    topic = target.get("topic") or ""
+    async with pool.page(spec) as page:
+        start = time.monotonic()
+        await goto(page, url, timeout=render_timeout_ms(spec))
+        record_latency(spec["name"], time.monotonic() - start)
+        for action, *args in spec.get("index_actions", []):
+            args = [arg.replace("{topic}", topic) if isinstance(arg, str) else arg for arg in args]
+            if action == "wait":
+                await page.wait_for_timeout(*args)
+            elif action == "wait_for":
+                await wait_for_selector(spec, page, *args)
+            else:
+                await getattr(page, action)(*args)
+        return await page.content()
+
+
+def feed_urls(spec: dict, target: dict) -> list:
+    feed_url = spec.get("feed_url")
+    if isinstance(feed_url, dict):
+        feed_url = feed_url.get(target.get("topic"))
+    if not feed_url:
+        return []
+    return feed_url if isinstance(feed_url, list) else [feed_url]
+
+
+async def discover_feed_links(spec: dict, target: dict, max_links: int, session) -> list:
+    """Collects up to `max_links` (link, location) pairs from the target's feeds, following sitemap indexes."""
+    links = []
+    urls = feed_urls(spec, target)
+    while urls and len(links) < max_links:
+        url = urls.pop(0)
+        try:
+            xml = await fetch_source_page(spec, session, url)
+        except Exception as e:
+            print(f"Error fetching feed {url}: {e}")
+            continue
+        if not xml:
+            continue
+        found, sitemaps = feed_links(xml, max_links - len(links))
+        urls.extend(sitemaps)
+        found = [urljoin(url, link) for link in found]
+        if spec.get("link_filter"):
+            found = [link for link in found if spec["link_filter"](link)]
+        links.extend((link, target.get("location")) for link in found)
+
+    return unique_links(links)[:max_links]
+
+
+async def discover_links(spec: dict, target: dict, max_links: int, session, pool) -> list:
+    """Collects up to `max_links` (link, location) pairs for a target, from its feeds or index pages."""
+    if spec.get("discovery") == "feed" and feed_urls(spec, target):
+        links = await discover_feed_links(spec, target, max_links, session)
+        if links:
+            return links
+        print(f"No links in the feeds of {spec['name']}, falling back to its index pages")
+
+    links = []
+    for url in target["urls"]:
+        html = await load_index(spec, url, target, session, pool)
+        if html is None:
+            continue
+        soup = parse_html(html)
+
+        if "sections" not in spec:
+            page_links = select_links(spec, soup, url)
+            selector = spec["link_selector"] if isinstance(spec["link_selector"], str) else "link_selector"
+            record_selectors(spec["name"], [] if page_links else [selector])
+            links.extend((link, target.get("location")) for link in page_links)
+            continue
+
+        # Article links live on section pages, walk them until there are enough links
+        for section_url, section_location in spec["sections"](soup, url):
+            try:
+                section_html = await fetch_source_page(spec, session, section_url)
+            except Exception as e:
+                print(f"Error processing {section_url}: {e}")
+                continue
+            if section_html:
+                section_links = select_links(spec, parse_html(section_html), section_url)[:max_links]
+                links.extend((link, section_location) for link in section_links)
+            if len(links) >= max_links:
+                break
+
+    return unique_links(links)[:max_links]
+
+
+async def stream_target(spec: dict, target: dict, max_articles: int, session, pool, refresh: bool = False):
+    """
+    Yields up to `max_articles` articles of one target as they are parsed.
+    Index listings and articles still fresh in the article store are not fetched again.
+    `refresh` refetches both, which is cheap for unchanged pages thanks to the HTTP cache,
+    and renews their fetched_at in the store.
+    """
+    store = default_store()
+    # Search pages share one URL across topics, so the topic is part of the key
+    listing_key = "|".join([spec["name"], *target["urls"], target.get("topic") or ""])
+    links = None if refresh else store.get_links(listing_key)
+    if links is None:
+        try:
+            links = await discover_links(spec, target, 2 * max_articles, session, pool)
+        except Exception as e:
+            print(f"Error collecting links from {target['urls']} on {spec['name']}: {e}")
+            return
+        if links:
+            store.put_links(listing_key, links)
+
+    locations = dict(links)
+    counts = article_counts[spec["name"]]
+
+    # Only the picklable extraction settings travel to the parse pool
+    extraction = {key: spec[key] for key in EXTRACTION_KEYS if key in spec}
+
+    async def parse(html, link):
+        await save_snapshot(spec["name"], link, html)
+        article, cpu = await run_parser(extract_article, extraction, html, link)
+        parse_cpu[spec["name"]] += cpu
+        return article
+
+    async def parse_rendered(page, link):
+        return await parse(await page.content(), link)
+
+    async def fetch_article(link):
+        article = None if refresh else store.get(link)
+        if article:
+            counts["stored"] += 1
+            return tag_location(article, link)
+
+        started = False
+
+        async def load():
+            nonlocal started
+            started = True
+            try:
+                if spec.get("browser_fallback"):
+                    start = time.monotonic()
+                    article = await fetch_two_tier(link, spec["name"], session, pool, parse, parse_rendered,
+                                                   timeout=render_timeout_ms(spec), cache_ttl=spec.get("cache_ttl"),
+                                                   required=[spec["body_selector"]], spec=spec)
+                    record_latency(spec["name"], time.monotonic() - start)
+                else:
+                    html = await fetch_source_page(spec, session, link)
+                    article = await parse(html, link) if html else None
+                    if html:
+                        # An article page without body paragraphs means the body selector went stale
+                        record_selectors(spec["name"], [] if article else [spec["body_selector"]])
+            except asyncio.CancelledError:
+                counts["cancelled"] += 1
+                raise
+            except Exception:
+                counts["fetched"] += 1
+                raise
+            counts["fetched"] += 1
+            if article:
+                counts["parsed"] += 1
+                store.put(link, spec["name"], article)
+            return article
+
+        # Scrapers extracting a link the same way share one fetch and parse of it
+        article = await single_flight((canonical_url(link), extraction_key(spec)), load)
+        if not started:
+            counts["shared"] += 1
+        return tag_location(dict(article), link) if article else None
+
+    def tag_location(article, link):
+        if spec["kind"] == "location":
+            location_from_link = spec.get("location_from_link")
+            article["location"] = location_from_link(link) if location_from_link else locations[link]
+        return article
+
+    # Only quota + margin pages are in flight, a failed page is replaced by the next link
+    window = max_articles + OVERFETCH_MARGIN
+    async for article in stream_articles([link for link, _ in links], fetch_article, max_articles, window=window):
+        counts["used"] += 1
+        yield article
+
+
+async def stream_site(spec: dict, max_articles: int = 5, location: list = None, topics: list = None,
+                      index_url=None, session=None, pool=None, refresh: bool = False):
+    """
+    Async generator over the articles of a site described by `spec`, yielded as
+    soon as they are parsed. Topic specs yield up to `max_articles` per topic,
+    the other kinds up to `max_articles` in total. `refresh` bypasses the article store.
+    """
+    async with borrowed(pool) as pool, borrowed_session(session) as session:
+        targets = await resolve_targets(spec, index_url, location, topics, session)
+        if not targets:
+            print(f"No matching index page on {spec['name']} for '{location}'. Skipping scraping.")
+            return
+
+        print(f"Searching for {spec['kind']} news on {spec['name']}...")
+        streams = {i: stream_target(spec, target, max_articles, session, pool, refresh) for i, target in enumerate(targets)}
+        async for _, article in merge_streams(streams):
+            yield article
+
+
+async def scrape_site(spec: dict, max_articles: int = 5, location: list = None, topics: list = None,
+                      index_url=None, session=None, pool=None) -> list:
+    """Scrapes a site described by `spec` and returns all of its articles, see `stream_site`."""
+    news = [article async for article in stream_site(spec, max_articles, location, topics, index_url, session, pool)]
+    print(f"Scraping complete. Total articles scraped from {spec['name']}:", len(news))
+    return news
@@ -0,0 +1,65 @@
+"""
+Article link discovery from RSS, Atom and news-sitemap feeds.
+
+Feeds are fed to a pull parser in chunks and every item is dropped
+once its link is read, so parsing stops as soon as enough links are
+found and never builds the whole document tree.
+"""
+from xml.etree.ElementTree import XMLPullParser, ParseError
+
+CHUNK_SIZE = 16 * 1024
+
+
+def _local(tag: str) -> str:
+    """Tag name without its namespace, e.g. "loc" for "{http://www.sitemaps.org/...}loc"."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(elem, name: str) -> str:
+    for child in elem:
+        if _local(child.tag) == name and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def _atom_link(entry) -> str:
+    for child in entry:
+        if _local(child.tag) == "link" and child.get("rel", "alternate") == "alternate" and child.get("href"):
+            return child.get("href").strip()
+    return None
+
+
+def feed_links(xml: str, max_links: int = None) -> tuple:
+    """
+    Returns (links, sitemaps) for an RSS, Atom or sitemap document: the article
+    links in document order, and the child sitemaps listed by a sitemap index.
+    A malformed document yields the links read before the error.
+    """
+    parser = XMLPullParser(events=("end",))
+    links, sitemaps = [], []
+    try:
+        for start in range(0, len(xml), CHUNK_SIZE):
+            parser.feed(xml[start:start + CHUNK_SIZE])
+            for _, elem in parser.read_events():
+                tag = _local(elem.tag)
+                if tag == "item":
+                    link = _child_text(elem, "link") or _child_text(elem, "guid")
+                elif tag == "entry":
+                    link = _atom_link(elem)
+                elif tag == "url":
+                    link = _child_text(elem, "loc")
+                elif tag == "sitemap":
+                    sitemaps.append(_child_text(elem, "loc"))
+                    elem.clear()
+                    continue
+                else:
+                    continue
+
+                elem.clear()
+                if link:
+                    links.append(link)
+                if max_links and len(links) >= max_links:
+                    return links, [s for s in sitemaps if s]
+    except ParseError as e:
+        print(f"Malformed feed, keeping the {len(links)} links read before the error: {e}")
+    return links, [s for s in sitemaps if s]
@@ -0,0 +1,250 @@
+"""
+Concurrent article fetching shared by the scrapers,
+with a per-domain limit on requests in flight, and
+helpers to stream and merge articles as they arrive.
+"""
+import asyncio
+import weakref
+from collections import defaultdict
+from urllib.parse import urlparse
+from scrapers.http_cache import default_cache
+from scrapers.rate_limit import goto
+from scrapers.selector_health import missing_selectors, record_selectors
+
+# Maximum number of requests in flight to the same domain
+PER_HOST_LIMIT = 4
+
+# Semaphores are bound to an event loop, so keep one set per loop
+_host_semaphores = weakref.WeakKeyDictionary()
+
+# Per-source counts of which tier produced each article
+tier_counts = defaultdict(lambda: {"http": 0, "browser": 0, "failed": 0})
+
+# Per-source counts of article pages fetched, parsed into an article, served from the
+# article store instead, taken from another scraper's fetch in flight, and handed to the pipeline.
+# Fetches cancelled before they completed, once the quota was met, are counted apart.
+article_counts = defaultdict(lambda: {"fetched": 0, "parsed": 0, "stored": 0, "shared": 0, "used": 0,
+                                      "cancelled": 0})
+
+# Fetches in flight per loop, keyed by what they fetch, so concurrent callers share one
+_in_flight = weakref.WeakKeyDictionary()
+
+
+def host_semaphore(url: str, limit: int = PER_HOST_LIMIT) -> asyncio.Semaphore:
+    """Returns the semaphore limiting concurrent requests to the domain of `url`."""
+    loop = asyncio.get_running_loop()
+    semaphores = _host_semaphores.setdefault(loop, {})
+    host = urlparse(url).netloc.lower()
+    if host not in semaphores:
+        semaphores[host] = asyncio.Semaphore(limit)
+    return semaphores[host]
+
+
+async def single_flight(key, fetch):
+    """
+    Awaits `fetch()`, or the call already in flight for `key`, so concurrent callers
+    with the same key share one result. The call runs as its own task: a caller
+    that is cancelled leaves it running for the others, and it is only cancelled
+    once nobody waits for it anymore.
+    """
+    flights = _in_flight.setdefault(asyncio.get_running_loop(), {})
+
+    def forget(flight):
+        # A newer call for the same key may already have taken its place
+        if flights.get(key) is flight:
+            del flights[key]
+
+    flight = flights.get(key)
+    # A call that is done or being cancelled can't be joined anymore, start a new one
+    if flight is None or flight["task"].done() or flight["task"].cancelling():
+        flight = flights[key] = {"task": asyncio.create_task(fetch()), "waiters": 0}
+        flight["task"].add_done_callback(lambda _, flight=flight: forget(flight))
+
+    flight["waiters"] += 1
+    try:
+        return await asyncio.shield(flight["task"])
+    finally:
+        flight["waiters"] -= 1
+        if not flight["waiters"]:
+            forget(flight)
+            flight["task"].cancel()
+
+
+async def _fetch_guarded(link: str, fetch_one, per_host_limit: int):
+    """Runs `fetch_one(link)` under the domain's semaphore, logging errors as a skipped link."""
+    async with host_semaphore(link, per_host_limit):
+        try:
+            return await fetch_one(link)
+        except asyncio.TimeoutError:
+            print(f"Timeout error for link {link}")
+        except Exception as e:
+            print(f"Error processing {link}: {e}")
+        return None
+
+
+async def fetch_articles(links: list, fetch_one, max_articles: int, per_host_limit: int = PER_HOST_LIMIT) -> list:
+    """
+    Runs `fetch_one(link)` for all links concurrently and returns the first
+    `max_articles` successful results in link order.
+
+    `fetch_one` returns an article dict, or None when the link should be skipped.
+    Outstanding fetches are cancelled as soon as the quota is met.
+    """
+    tasks = [asyncio.create_task(_fetch_guarded(link, fetch_one, per_host_limit)) for link in links]
+    news = []
+    try:
+        for task in tasks:
+            article = await task
+            if article:
+                news.append(article)
+                if len(news) >= max_articles:
+                    break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return news
+
+
+async def stream_articles(links: list, fetch_one, max_articles: int, per_host_limit: int = PER_HOST_LIMIT, window: int = None):
+    """
+    Async generator version of `fetch_articles`: yields articles as soon as they
+    are parsed, in completion order, and cancels the rest once `max_articles`
+    have been yielded or the consumer stops iterating.
+
+    At most `window` links are fetched at once (all of them by default), a link
+    that comes back empty is replaced by the next one.
+    """
+    remaining_links = iter(links)
+    running = set()
+    count = 0
+
+    def start_next():
+        link = next(remaining_links, None)
+        if link is not None:
+            running.add(asyncio.create_task(_fetch_guarded(link, fetch_one, per_host_limit)))
+
+    try:
+        for _ in range(window or len(links)):
+            start_next()
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                running.discard(task)
+                article = task.result()
+                if not article:
+                    start_next()
+                    continue
+                yield article
+                count += 1
+                if count >= max_articles:
+                    return
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+
+async def merge_streams(streams: dict, limit: int = None, timeout: float = None, on_finish=None):
+    """
+    Merges named async generators into one stream of (name, item) pairs in arrival order.
+
+    A stream stops being pulled once it has produced `limit` items or has run for
+    `timeout` seconds, which may also be a dict of seconds per stream name.
+    `on_finish(name, count, error)` is awaited when a stream ends, with the
+    TimeoutError or exception that ended it, if any. Streams still running when
+    the consumer stops iterating are cancelled and reported with a CancelledError.
+    """
+    queue = asyncio.Queue()
+    finished = object()
+
+    async def pump(name, stream):
+        count = 0
+        error = None
+
+        async def drain():
+            nonlocal count
+            async for item in stream:
+                await queue.put((name, item))
+                count += 1
+                if limit and count >= limit:
+                    break
+
+        try:
+            await asyncio.wait_for(drain(), timeout.get(name) if isinstance(timeout, dict) else timeout)
+        except asyncio.CancelledError as e:
+            # The consumer stopped early, report the stream as cut off
+            error = e
+            raise
+        except Exception as e:
+            error = e
+        finally:
+            await stream.aclose()
+            if on_finish:
+                await on_finish(name, count, error)
+            queue.put_nowait((name, finished))
+
+    tasks = [asyncio.create_task(pump(name, stream)) for name, stream in streams.items()]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            name, item = await queue.get()
+            if item is finished:
+                remaining -= 1
+            else:
+                yield name, item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def fallback_stats() -> dict:
+    """Returns per-source counts of articles served over HTTP, by the browser fallback, or not at all."""
+    return {source: dict(counts) for source, counts in tier_counts.items()}
+
+
+def quota_stats() -> dict:
+    """Returns per-source article counts with the share of loaded articles that ended up used."""
+    stats = {}
+    for source, counts in article_counts.items():
+        loaded = counts["fetched"] + counts["stored"] + counts["shared"]
+        stats[source] = {**counts, "used_ratio": round(counts["used"] / loaded, 2) if loaded else None}
+    return stats
+
+
+async def fetch_two_tier(link: str, source: str, session, pool, parse_html, parse_page, timeout: int = 20000,
+                         cache_ttl: int = None, required: list = None, spec: dict = None):
+    """
+    Fetches an article with a plain HTTP GET, through the HTTP cache, and awaits
+    `parse_html(html, link)` over it. Only when that comes back empty is the page
+    rendered in a browser tab leased from `pool`, and `parse_page(page, link)` run against it.
+    The rendered page is given up as soon as it is loaded if any `required` selector is missing.
+    `spec` sets the browser's resource blocking.
+    """
+    try:
+        status, html = await default_cache().get(session, link, ttl=cache_ttl)
+        if status == 200:
+            article = await parse_html(html, link)
+            if article:
+                record_selectors(source, [])
+                tier_counts[source]["http"] += 1
+                return article
+    except asyncio.TimeoutError:
+        print(f"Timeout error for link {link}, falling back to the browser")
+    except Exception as e:
+        print(f"HTTP fetch failed for {link}, falling back to the browser: {e}")
+
+    try:
+        async with pool.page(spec) as page:
+            await goto(page, link, timeout=timeout, wait_until="domcontentloaded")
+            missing = await missing_selectors(page, required or [])
+            record_selectors(source, missing)
+            article = None if missing else await parse_page(page, link)
+    except Exception:
+        tier_counts[source]["failed"] += 1
+        raise
+
+    tier_counts[source]["browser" if article else "failed"] += 1
+    return article
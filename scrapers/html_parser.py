@@ -0,0 +1,117 @@
+"""
+Pluggable HTML parser backend for the scrapers.
+
+`parse_html` returns an object with the BeautifulSoup calls the scrapers
+use (find, find_all, select, select_one, get_text, get, [] and .text),
+built by the backend named in SCRAPER_HTML_PARSER:
+    html.parser - BeautifulSoup with the pure-Python parser
+    lxml        - BeautifulSoup with the lxml tree builder (default)
+    selectolax  - selectolax's lexbor engine behind a thin adapter
+"""
+import os
+from bs4 import BeautifulSoup
+
+HTML_PARSER = os.getenv("SCRAPER_HTML_PARSER", "lxml")
+BACKENDS = ["html.parser", "lxml", "selectolax"]
+
+
+def parse_html(html, backend: str = None):
+    """Parses an HTML document with the configured backend."""
+    backend = backend or HTML_PARSER
+    if backend == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+        return SelectolaxElement(LexborHTMLParser(html).root, is_document=True)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend '{backend}', expected one of {BACKENDS}")
+    return BeautifulSoup(html, backend)
+
+
+def _matches(value, expected) -> bool:
+    """Applies a BeautifulSoup style attribute filter to an attribute value."""
+    if expected is True:
+        return value is not None
+    if callable(expected):
+        return bool(expected(value))
+    return value == expected
+
+
+def _class_matches(classes, expected) -> bool:
+    """class_ filters are tried against every class of the element, like BeautifulSoup does."""
+    if not classes:
+        return _matches(None, expected) if callable(expected) else False
+    if not callable(expected) and expected is not True and " ".join(classes) == expected:
+        return True
+    return any(_matches(c, expected) for c in classes)
+
+
+class SelectolaxElement:
+    """Wraps a selectolax node with the subset of the BeautifulSoup element API used by the scrapers."""
+
+    def __init__(self, node, is_document: bool = False):
+        self._node = node
+        self._is_document = is_document
+
+    @property
+    def name(self) -> str:
+        return self._node.tag
+
+    @property
+    def attrs(self) -> dict:
+        attrs = dict(self._node.attributes)
+        if "class" in attrs:
+            attrs["class"] = (attrs["class"] or "").split()
+        return attrs
+
+    def get(self, key, default=None):
+        value = self.attrs.get(key)
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        value = self.attrs.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __bool__(self) -> bool:
+        return True
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        return self._node.text(deep=True, separator=separator, strip=strip)
+
+    @property
+    def text(self) -> str:
+        return self.get_text()
+
+    def _descendants(self, css: str) -> list:
+        nodes = self._node.css(css)
+        if self._is_document:
+            return nodes
+        return [n for n in nodes if n.mem_id != self._node.mem_id]
+
+    def select(self, css: str) -> list:
+        return [SelectolaxElement(n) for n in self._descendants(css)]
+
+    def select_one(self, css: str):
+        nodes = self.select(css)
+        return nodes[0] if nodes else None
+
+    def find_all(self, name=None, attrs: dict = None, limit: int = None, **kwargs) -> list:
+        filters = dict(attrs or {})
+        filters.update(kwargs)
+        class_filter = filters.pop("class_", filters.pop("class", None))
+
+        found = []
+        for node in self._descendants(name if isinstance(name, str) else "*"):
+            node_attrs = node.attributes
+            if class_filter is not None and not _class_matches((node_attrs.get("class") or "").split(), class_filter):
+                continue
+            if not all(_matches(node_attrs.get(key), expected) for key, expected in filters.items()):
+                continue
+            found.append(SelectolaxElement(node))
+            if limit and len(found) >= limit:
+                break
+        return found
+
+    def find(self, name=None, attrs: dict = None, **kwargs):
+        found = self.find_all(name, attrs, limit=1, **kwargs)
+        return found[0] if found else None
@@ -0,0 +1,174 @@
+"""
+Record / replay archive of the HTTP traffic of the scrapers, so their
+performance can be measured without hitting the live sites.
+
+With SCRAPER_HTTP_ARCHIVE_MODE=record every HTTP fetch made through the
+HTTP cache and every response the browser receives is saved under
+SCRAPER_HTTP_ARCHIVE. With SCRAPER_HTTP_ARCHIVE_MODE=replay the HTTP
+fetches are sent to a local ReplayServer at SCRAPER_REPLAY_SERVER instead
+of the sites, and the browser's requests are answered from the archive.
+Both add the configured latency and bandwidth limit to every response.
+Requests missing from the archive get a 404.
+
+Entries are stored like the HTTP cache: a <sha256(url)>.json metadata
+file next to a .body file.
+"""
+import os
+import json
+import asyncio
+import hashlib
+import threading
+from urllib.parse import urlencode
+from aiohttp import web
+
+ARCHIVE_DIR = os.getenv("SCRAPER_HTTP_ARCHIVE", "http_archive")
+# "record", "replay", or empty to talk to the live sites
+ARCHIVE_MODE = os.getenv("SCRAPER_HTTP_ARCHIVE_MODE", "")
+REPLAY_SERVER = os.getenv("SCRAPER_REPLAY_SERVER", "http://127.0.0.1:8765")
+
+# Injected per response while replaying, bandwidth 0 means unlimited
+REPLAY_LATENCY_MS = int(os.getenv("SCRAPER_REPLAY_LATENCY_MS", "0"))
+REPLAY_BANDWIDTH_KBPS = int(os.getenv("SCRAPER_REPLAY_BANDWIDTH_KBPS", "0"))
+
+REDIRECT_STATUSES = range(300, 400)
+
+
+def transfer_delay(size: int, latency_ms: int = REPLAY_LATENCY_MS, bandwidth_kbps: int = REPLAY_BANDWIDTH_KBPS) -> float:
+    """Seconds a response of `size` bytes takes over the simulated link."""
+    delay = latency_ms / 1000
+    if bandwidth_kbps:
+        delay += size * 8 / (bandwidth_kbps * 1000)
+    return delay
+
+
+class HttpArchive:
+    def __init__(self, directory: str = ARCHIVE_DIR):
+        self.directory = directory
+        self.counters = {"recorded": 0, "recorded_bytes": 0, "served": 0, "served_bytes": 0, "missing": 0}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+    def save(self, url: str, status: int, content_type: str, body: bytes):
+        path = self._path(url)
+        with open(path + ".body", "wb") as f:
+            f.write(body)
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            json.dump({"url": url, "status": status, "content_type": content_type}, f)
+        self.counters["recorded"] += 1
+        self.counters["recorded_bytes"] += len(body)
+
+    def load(self, url: str) -> tuple:
+        """Returns (meta, body) for `url`, or (None, None) when it wasn't recorded."""
+        path = self._path(url)
+        try:
+            with open(path + ".json", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(path + ".body", "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            self.counters["missing"] += 1
+            return None, None
+        self.counters["served"] += 1
+        self.counters["served_bytes"] += len(body)
+        return meta, body
+
+    def stats(self) -> dict:
+        return dict(self.counters)
+
+
+_default_archive = None
+
+
+def default_archive() -> HttpArchive:
+    """Returns the process-wide archive, created on first use."""
+    global _default_archive
+    if _default_archive is None:
+        _default_archive = HttpArchive()
+    return _default_archive
+
+
+def request_url(url: str) -> str:
+    """The URL an HTTP fetch of `url` is sent to, the replay server's while replaying."""
+    if ARCHIVE_MODE != "replay":
+        return url
+    return f"{REPLAY_SERVER}/replay?{urlencode({'url': url})}"
+
+
+async def capture(url: str, status: int, content_type: str, body: bytes = b""):
+    """Saves a response to the archive while recording, does nothing otherwise."""
+    if ARCHIVE_MODE == "record" and status != 304:
+        await asyncio.to_thread(default_archive().save, url, status, content_type, body)
+
+
+async def _capture_browser_response(response):
+    if response.status in REDIRECT_STATUSES:
+        return
+    try:
+        body = await response.body()
+    except Exception:
+        # Responses of closed pages or aborted requests have no body to save
+        return
+    await capture(response.url, response.status, response.headers.get("content-type"), body)
+
+
+async def _replay_route(route):
+    meta, body = await asyncio.to_thread(default_archive().load, route.request.url)
+    if meta is None:
+        await route.fulfill(status=404, body=b"")
+        return
+    await asyncio.sleep(transfer_delay(len(body)))
+    headers = {"content-type": meta["content_type"]} if meta.get("content_type") else {}
+    await route.fulfill(status=meta["status"], headers=headers, body=body)
+
+
+async def install_browser_hooks(context):
+    """Records or replays every request of a browser context, depending on the archive mode."""
+    if ARCHIVE_MODE == "record":
+        context.on("response", lambda response: asyncio.create_task(_capture_browser_response(response)))
+    elif ARCHIVE_MODE == "replay":
+        await context.route("**/*", _replay_route)
+
+
+class ReplayServer:
+    """Local aiohttp stand-in for the news sites, serving the archive on /replay?url=..."""
+
+    def __init__(self, archive: HttpArchive = None, host: str = "127.0.0.1", port: int = 8765,
+                 latency_ms: int = REPLAY_LATENCY_MS, bandwidth_kbps: int = REPLAY_BANDWIDTH_KBPS):
+        self.archive = archive or default_archive()
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.bandwidth_kbps = bandwidth_kbps
+        self._loop = None
+        self._runner = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        meta, body = await asyncio.to_thread(self.archive.load, request.query.get("url", ""))
+        if meta is None:
+            return web.Response(status=404)
+        await asyncio.sleep(transfer_delay(len(body), self.latency_ms, self.bandwidth_kbps))
+        headers = {"Content-Type": meta["content_type"]} if meta.get("content_type") else {}
+        return web.Response(status=meta["status"], body=body, headers=headers)
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_get("/replay", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    def start(self) -> str:
+        """Serves the archive from a background thread, so the scrapers' loop isn't slowed down. Returns the base URL."""
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="replay-server", daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return f"http://{self.host}:{self.port}"
+
+    def stop(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
@@ -0,0 +1,179 @@
+"""
+On-disk HTTP cache with conditional GET for the scrapers.
+
+Bodies are stored with their ETag / Last-Modified validators and
+revalidated with If-None-Match / If-Modified-Since, so an unchanged page
+costs a 304 instead of the full HTML. Sources that send no validators
+can opt into TTL-only caching: the stored body is served without any
+request until it is `ttl` seconds old.
+
+Each entry is a <sha256(url)>.json metadata file next to a .body file.
+File reads and writes run in a worker thread to keep the loop free.
+`purge` drops entries older than MAX_AGE and, past MAX_BYTES, the least
+recently stored ones. The prefetch scheduler runs it periodically.
+"""
+import os
+import json
+import time
+import asyncio
+import hashlib
+import tempfile
+from scrapers.rate_limit import RETRIES, acquire, record_response
+from scrapers.http_archive import request_url, capture
+
+CACHE_DIR = os.getenv("SCRAPER_HTTP_CACHE_DIR", ".http_cache")
+
+# Seconds a cached body is served without revalidation unless the spec sets its own cache_ttl
+DEFAULT_TTL = int(os.getenv("SCRAPER_HTTP_CACHE_TTL", "0"))
+
+# Entries not stored or revalidated for this many seconds are purged, and the oldest
+# entries go first once the cache is larger than this many megabytes
+MAX_AGE = int(os.getenv("SCRAPER_HTTP_CACHE_MAX_AGE", str(7 * 24 * 3600)))
+MAX_BYTES = int(os.getenv("SCRAPER_HTTP_CACHE_MAX_MB", "500")) * 1024 * 1024
+
+
+class HttpCache:
+    """Conditional-GET cache keyed by URL. An empty `directory` disables caching."""
+
+    def __init__(self, directory: str = CACHE_DIR, default_ttl: int = DEFAULT_TTL):
+        self.directory = directory
+        self.default_ttl = default_ttl
+        self.counters = {"hits": 0, "revalidated": 0, "misses": 0, "bytes_saved": 0, "purged": 0}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+    def _load(self, url: str):
+        path = self._path(url)
+        try:
+            with open(path + ".json", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(path + ".body", "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def _write(self, path: str, data: bytes):
+        """Replaces `path` with `data` through a temp file of its own, so concurrent stores of a URL never mix."""
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as f:
+            f.write(data)
+        os.replace(f.name, path)
+
+    def _store(self, url: str, meta: dict, body: bytes = None):
+        path = self._path(url)
+        if body is not None:
+            self._write(path + ".body", body)
+        self._write(path + ".json", json.dumps(meta).encode("utf-8"))
+
+    def _hit(self, meta: dict, body: bytes) -> tuple:
+        self.counters["bytes_saved"] += len(body)
+        return 200, body.decode(meta.get("encoding") or "utf-8", "replace")
+
+    async def get(self, session, url: str, timeout=None, ttl: int = None) -> tuple:
+        """
+        GETs `url` through the cache and returns (status, text). Text is None
+        on non-200 responses. Fresh entries are served without a request,
+        the others wait for the domain's politeness limit.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        meta, body = await asyncio.to_thread(self._load, url) if self.directory else (None, None)
+
+        if meta and time.time() - meta["stored_at"] < ttl:
+            self.counters["hits"] += 1
+            return self._hit(meta, body)
+
+        headers = {}
+        if meta and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta and meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        for attempt in range(RETRIES + 1):
+            await acquire(url)
+            async with session.get(request_url(url), headers=headers, timeout=timeout) as response:
+                retry = record_response(url, response.status, response.headers.get("Retry-After"))
+                if retry and attempt < RETRIES:
+                    continue
+
+                if response.status == 304 and meta:
+                    self.counters["revalidated"] += 1
+                    meta["stored_at"] = time.time()
+                    await asyncio.to_thread(self._store, url, meta)
+                    return self._hit(meta, body)
+
+                self.counters["misses"] += 1
+                if response.status != 200:
+                    await capture(url, response.status, response.headers.get("Content-Type"))
+                    return response.status, None
+                body = await response.read()
+                await capture(url, response.status, response.headers.get("Content-Type"), body)
+                encoding = response.get_encoding()
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                break
+
+        # Without validators a body can only be reused under a TTL
+        if self.directory and (etag or last_modified or ttl > 0):
+            meta = {"url": url, "etag": etag, "last_modified": last_modified,
+                    "encoding": encoding, "stored_at": time.time()}
+            await asyncio.to_thread(self._store, url, meta, body)
+        return 200, body.decode(encoding, "replace")
+
+    def purge(self, max_age: int = MAX_AGE, max_bytes: int = MAX_BYTES) -> int:
+        """Deletes expired entries, then the oldest ones until the cache fits in `max_bytes`. Returns how many went."""
+        if not self.directory:
+            return 0
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp"):
+                # Left behind by a store that died before its rename
+                try:
+                    if time.time() - os.path.getmtime(os.path.join(self.directory, name)) > max_age:
+                        os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+                continue
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name[:-len(".json")])
+            try:
+                # The metadata file is rewritten on every store and revalidation
+                stored_at = os.path.getmtime(path + ".json")
+                size = os.path.getsize(path + ".json") + os.path.getsize(path + ".body")
+            except OSError:
+                size = 0
+                stored_at = 0
+            entries.append((stored_at, size, path))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        now = time.time()
+        purged = 0
+        for stored_at, size, path in entries:
+            if now - stored_at < max_age and total <= max_bytes:
+                break
+            for suffix in (".json", ".body"):
+                try:
+                    os.remove(path + suffix)
+                except OSError:
+                    pass
+            total -= size
+            purged += 1
+        self.counters["purged"] += purged
+        return purged
+
+    def stats(self) -> dict:
+        return dict(self.counters)
+
+
+_default_cache = None
+
+
+def default_cache() -> HttpCache:
+    """Returns the process-wide HTTP cache, created on first use."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = HttpCache()
+    return _default_cache
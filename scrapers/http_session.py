@@ -0,0 +1,69 @@
+"""
+Long-lived aiohttp session shared by all the HTTP scrapers,
+so TCP/TLS connections and DNS lookups are reused across queries.
+"""
+import asyncio
+import aiohttp
+from contextlib import asynccontextmanager
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-IN,en;q=0.9",
+}
+
+# Connection pool limits
+CONNECTION_LIMIT = 64
+CONNECTION_LIMIT_PER_HOST = 8
+KEEPALIVE_TIMEOUT = 60
+
+# Seconds a resolved hostname is kept in the DNS cache
+DNS_CACHE_TTL = 600
+
+# Default timeouts in seconds, scrapers can still pass a per-request timeout
+TOTAL_TIMEOUT = 30
+CONNECT_TIMEOUT = 10
+
+
+def _new_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=CONNECTION_LIMIT,
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        use_dns_cache=True,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    timeout = aiohttp.ClientTimeout(total=TOTAL_TIMEOUT, connect=CONNECT_TIMEOUT)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=DEFAULT_HEADERS)
+
+
+class HttpSessionManager:
+    """Creates the shared session on first use and closes it on shutdown."""
+
+    def __init__(self):
+        self._session = None
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> aiohttp.ClientSession:
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                self._session = _new_session()
+            return self._session
+
+    async def close(self):
+        """Shutdown hook, closes the session and its pooled connections."""
+        async with self._lock:
+            if self._session and not self._session.closed:
+                await self._session.close()
+            self._session = None
+
+
+@asynccontextmanager
+async def borrowed_session(session: aiohttp.ClientSession = None):
+    """Yields the given session, or a short-lived one that is closed on exit when none is given."""
+    if session is not None:
+        yield session
+        return
+
+    async with _new_session() as own_session:
+        yield own_session
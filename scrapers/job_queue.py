@@ -0,0 +1,258 @@
+"""
+Job queue between the chat process and the scrape workers.
+
+A job asks for one source to be scraped with its stream_site arguments
+(quota, location or topics), at most `limit` articles, within `timeout`
+seconds. Workers (scrape_worker.py, as many as needed) claim jobs,
+publish every article as soon as it is parsed and finish the job. The
+chat process reads the articles back with `queued_stream`, a drop-in for
+`stream_site`: closing it early (quota, timeout, deadline) cancels the job.
+
+JobQueue is the interface, SqliteJobQueue the local implementation,
+which any number of worker processes on the same machine can share.
+SCRAPER_JOB_QUEUE picks the backend, empty scrapes in-process.
+"""
+import os
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import threading
+from scrapers.source_health import record_latency
+
+JOB_QUEUE = os.getenv("SCRAPER_JOB_QUEUE", "")
+QUEUE_PATH = os.getenv("SCRAPER_JOB_QUEUE_PATH", "scrape_jobs.sqlite3")
+
+# Seconds between polls for new jobs or new results
+POLL_INTERVAL = 0.2
+# A running job whose worker hasn't checked in for this long is handed to another worker
+LEASE_SECONDS = 30
+# Finished jobs and their results are purged after this many seconds
+RETENTION_SECONDS = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    kwargs TEXT NOT NULL,
+    "limit" INTEGER,
+    timeout REAL,
+    status TEXT NOT NULL,
+    worker TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    heartbeat_at REAL,
+    latencies TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS results (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    article TEXT NOT NULL,
+    PRIMARY KEY (job_id, seq)
+);
+"""
+
+
+class JobQueue:
+    """Interface of the scrape job queues. Job statuses: queued, running, done, failed, cancelled."""
+
+    def enqueue(self, source: str, kwargs: dict, limit: int = None, timeout: float = None) -> str:
+        """Adds a job and returns its id."""
+        raise NotImplementedError
+
+    def claim(self, worker: str) -> dict:
+        """Hands the oldest queued job, or one whose worker went silent, to `worker`. None when there is none."""
+        raise NotImplementedError
+
+    def heartbeat(self, job_id: str, latencies: list = None) -> bool:
+        """
+        Renews the worker's lease on a job, storing the page load latencies of the
+        job so far if given. False when the job was cancelled and should stop.
+        """
+        raise NotImplementedError
+
+    def publish(self, job_id: str, article: dict):
+        raise NotImplementedError
+
+    def finish(self, job_id: str, error: str = None, latencies: list = None):
+        raise NotImplementedError
+
+    def cancel(self, job_id: str):
+        """Cancels a job that hasn't finished yet."""
+        raise NotImplementedError
+
+    def results(self, job_id: str, after: int = 0) -> tuple:
+        """
+        Returns (articles published after the first `after`, status, error, page load
+        latencies so far). A purged job reads as cancelled.
+        """
+        raise NotImplementedError
+
+    def purge(self, max_age: float = RETENTION_SECONDS):
+        """Drops finished jobs older than `max_age` seconds, with their results."""
+        raise NotImplementedError
+
+
+class SqliteJobQueue(JobQueue):
+    """Job queue in a local SQLite file, shared by the chat process and the workers."""
+
+    def __init__(self, path: str = QUEUE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        # Queue files created before jobs reported their latencies
+        if "latencies" not in [row[1] for row in self._db.execute("PRAGMA table_info(jobs)")]:
+            self._db.execute("ALTER TABLE jobs ADD COLUMN latencies TEXT")
+
+    def enqueue(self, source: str, kwargs: dict, limit: int = None, timeout: float = None) -> str:
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._db.execute(
+                'INSERT INTO jobs (id, source, kwargs, "limit", timeout, status, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (job_id, source, json.dumps(kwargs), limit, timeout, "queued", time.time()),
+            )
+        return job_id
+
+    def claim(self, worker: str) -> dict:
+        now = time.time()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so two workers never claim the same job
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    'SELECT id, source, kwargs, "limit", timeout FROM jobs '
+                    "WHERE status = 'queued' OR (status = 'running' AND heartbeat_at < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (now - LEASE_SECONDS,),
+                ).fetchone()
+                if row:
+                    self._db.execute(
+                        "UPDATE jobs SET status = 'running', worker = ?, heartbeat_at = ?, latencies = NULL WHERE id = ?",
+                        (worker, now, row[0]),
+                    )
+                    # Results of a worker that went silent are kept, readers have already seen some of
+                    # them. The job starts over and queued_stream skips the articles published again.
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        if not row:
+            return None
+        return {"id": row[0], "source": row[1], "kwargs": json.loads(row[2]), "limit": row[3], "timeout": row[4]}
+
+    def heartbeat(self, job_id: str, latencies: list = None) -> bool:
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET heartbeat_at = ?, latencies = COALESCE(?, latencies) WHERE id = ? AND status = 'running'",
+                (time.time(), json.dumps(latencies) if latencies is not None else None, job_id),
+            )
+        return cursor.rowcount > 0
+
+    def publish(self, job_id: str, article: dict):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO results (job_id, seq, article) "
+                "SELECT ?, COALESCE(MAX(seq), 0) + 1, ? FROM results WHERE job_id = ?",
+                (job_id, json.dumps(article, default=str), job_id),
+            )
+
+    def finish(self, job_id: str, error: str = None, latencies: list = None):
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, heartbeat_at = ?, latencies = COALESCE(?, latencies) "
+                "WHERE id = ? AND status = 'running'",
+                ("failed" if error else "done", error, time.time(),
+                 json.dumps(latencies) if latencies is not None else None, job_id),
+            )
+
+    def cancel(self, job_id: str):
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = 'cancelled' WHERE id = ? AND status IN ('queued', 'running')", (job_id,)
+            )
+
+    def results(self, job_id: str, after: int = 0) -> tuple:
+        with self._lock:
+            # Status first: once it reads done, every article was published before it
+            row = self._db.execute("SELECT status, error, latencies FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return [], "cancelled", None, []
+            status, error, latencies = row
+            rows = self._db.execute(
+                "SELECT article FROM results WHERE job_id = ? AND seq > ? ORDER BY seq", (job_id, after)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows], status, error, json.loads(latencies or "[]")
+
+    def purge(self, max_age: float = RETENTION_SECONDS):
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM results WHERE job_id IN "
+                "(SELECT id FROM jobs WHERE status IN ('done', 'failed', 'cancelled') AND created_at < ?)",
+                (time.time() - max_age,),
+            )
+            self._db.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed', 'cancelled') AND created_at < ?",
+                (time.time() - max_age,),
+            )
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+QUEUE_BACKENDS = {"sqlite": SqliteJobQueue}
+
+_default_queue = None
+
+
+def default_queue() -> JobQueue:
+    """Returns the process-wide queue of the SCRAPER_JOB_QUEUE backend, opened on first use."""
+    global _default_queue
+    if _default_queue is None:
+        if JOB_QUEUE not in QUEUE_BACKENDS:
+            raise ValueError(f"Unknown job queue '{JOB_QUEUE}', expected one of {list(QUEUE_BACKENDS)}")
+        _default_queue = QUEUE_BACKENDS[JOB_QUEUE]()
+    return _default_queue
+
+
+async def queued_stream(queue: JobQueue, source: str, kwargs: dict, limit: int = None, timeout: float = None):
+    """
+    Async generator over the articles of a scrape job run by a worker, yielded as
+    they are published. Raises when the job fails or is cancelled elsewhere,
+    closing the generator cancels it. The page load latencies the worker reports
+    are recorded for `source`, as stream_site would have in this process.
+    """
+    job_id = await asyncio.to_thread(queue.enqueue, source, kwargs, limit, timeout)
+    seen = 0
+    contents = set()
+    recorded = 0
+    try:
+        while True:
+            articles, status, error, latencies = await asyncio.to_thread(queue.results, job_id, seen)
+            # A job reclaimed from a silent worker reports its latencies from scratch
+            if len(latencies) < recorded:
+                recorded = 0
+            for seconds in latencies[recorded:]:
+                record_latency(source, seconds)
+            recorded = len(latencies)
+            for article in articles:
+                seen += 1
+                # A job reclaimed from a silent worker publishes its first articles again
+                if article.get("content") in contents:
+                    continue
+                contents.add(article.get("content"))
+                yield article
+            if status == "done":
+                return
+            if status == "failed":
+                raise RuntimeError(error)
+            if status == "cancelled":
+                raise RuntimeError(f"job {job_id} was cancelled or purged")
+            await asyncio.sleep(POLL_INTERVAL)
+    finally:
+        await asyncio.to_thread(queue.cancel, job_id)
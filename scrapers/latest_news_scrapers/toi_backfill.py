@@ -0,0 +1,184 @@
+"""
+Bulk historical backfill from the Times of India archive.
+
+Walks the archive day pages of a date range concurrently, fetches and
+extracts every listed article under the politeness rate limit, and writes
+one Parquet file per day. A day's file is only written once the whole day
+is done, so it doubles as the checkpoint: re-running the same command
+resumes with the days that are still missing.
+
+Usage:
+    python -m scrapers.latest_news_scrapers.toi_backfill --start 2024-11-01 --end 2025-01-31
+    python -m scrapers.latest_news_scrapers.toi_backfill --start 2025-01-01 --end 2025-01-07 --rate 5 --max-per-day 200
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import aiohttp
+from datetime import date, datetime, timedelta
+import pandas as pd
+from scrapers.engine import extract_article, parse_date
+from scrapers.fetch import fetch_articles
+from scrapers.html_parser import parse_html
+from scrapers.http_cache import HttpCache
+from scrapers.http_session import borrowed_session
+from scrapers.parse_pool import run_parser
+from scrapers.rate_limit import set_rate, rate_limit_stats
+from scrapers.latest_news_scrapers.toi_scraper import fetch_news, calculate_starttime, categorize_news, base_starttime
+
+ARCHIVE_URL = "https://timesofindia.indiatimes.com/"
+OUTPUT_DIR = "toi_archive"
+
+# Archive days walked at the same time, their article fetches share the domain's rate limit
+DAY_CONCURRENCY = 4
+
+# Used when an article page has no NewsArticle JSON-LD
+ARTICLE_SELECTORS = {
+    "title_selector": "h1.HNMDR",
+    "date_selector": "div.xf8Pm span",
+    "date_strip": ["Updated:", "IST"],
+    "date_format": "%b %d, %Y, %H:%M",
+    "body_selector": "div._s30J",
+    "body_strip": True,
+}
+
+# No caching, a backfill reads every page once
+PAGE_FETCHER = HttpCache(directory="")
+
+
+def _news_article(data):
+    """Finds the NewsArticle object in a JSON-LD document, which may be a list or a @graph."""
+    if isinstance(data, list):
+        return next((item for item in map(_news_article, data) if item), None)
+    if isinstance(data, dict):
+        if data.get("@type") in ("NewsArticle", "Article", "ReportageNewsArticle"):
+            return data
+        return _news_article(data.get("@graph", []))
+    return None
+
+
+def extract_toi_article(html: str, link: str) -> dict:
+    """Extracts an article from its JSON-LD, falling back to the page selectors. Runs in the parse pool."""
+    soup = parse_html(html)
+    for script in soup.select("script[type='application/ld+json']"):
+        try:
+            article = _news_article(json.loads(script.get_text()))
+        except ValueError:
+            continue
+        if article and article.get("articleBody"):
+            return {
+                "title": article.get("headline", "").strip(),
+                "date_time": parse_date({}, article.get("datePublished")),
+                "content": article["articleBody"].strip(),
+            }
+    return extract_article(ARTICLE_SELECTORS, html, link)
+
+
+def day_path(output_dir: str, day: date) -> str:
+    return os.path.join(output_dir, f"toi_{day.isoformat()}.parquet")
+
+
+def write_day(path: str, day: date, articles: list):
+    df = pd.DataFrame(articles, columns=["url", "title", "date_time", "content", "category"])
+    df.insert(0, "archive_date", day.isoformat())
+    # Unparseable dates are kept as their raw text
+    df["date_time"] = df["date_time"].astype(str)
+    df.to_parquet(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+
+
+async def backfill_day(day: date, output_dir: str, session, max_per_day: int = None) -> tuple:
+    """
+    Fetches every article listed for `day` and writes them out. The day is only
+    written, and so checkpointed, when no article fetch failed for a reason that may
+    pass (rate limiting, server errors, timeouts, connection errors). Articles that
+    are gone for good, like a 404, are skipped. Returns (links, articles, failed).
+    """
+    starttime = calculate_starttime(base_starttime, datetime(day.year, day.month, day.day))
+    links = await fetch_news(day.year, day.month, day.day, starttime, session)
+    if max_per_day:
+        links = links[:max_per_day]
+    if not links:
+        # Not checkpointed, a failed listing is retried on the next run
+        return 0, 0, 0
+
+    failed = []
+
+    async def fetch_one(link):
+        try:
+            status, html = await PAGE_FETCHER.get(session, link)
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            print(f"Error fetching {link}, retried on the next run: {e!r}")
+            failed.append(link)
+            return None
+        if status == 429 or status >= 500:
+            print(f"Status {status} for {link}, retried on the next run")
+            failed.append(link)
+            return None
+        if status != 200:
+            print(f"Status {status} for {link}, skipped")
+            return None
+        article, _ = await run_parser(extract_toi_article, html, link)
+        # An article page without a body is skipped for good, it won't have one next time either
+        if not article:
+            return None
+        return {"url": link, **article, "category": categorize_news(article["title"], article["content"])}
+
+    articles = await fetch_articles(links, fetch_one, len(links))
+    if not failed:
+        write_day(day_path(output_dir, day), day, articles)
+    return len(links), len(articles), len(failed)
+
+
+async def backfill(start: date, end: date, output_dir: str = OUTPUT_DIR, days_concurrency: int = DAY_CONCURRENCY,
+                   max_per_day: int = None):
+    """Backfills every day from `start` to `end` inclusive that has no file in `output_dir` yet."""
+    os.makedirs(output_dir, exist_ok=True)
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    pending = [day for day in days if not os.path.exists(day_path(output_dir, day))]
+    print(f"Backfilling {len(pending)} of {len(days)} days into {output_dir}, {len(days) - len(pending)} already done")
+
+    limit = asyncio.Semaphore(days_concurrency)
+    started = time.monotonic()
+    totals = {"days": 0, "links": 0, "articles": 0}
+
+    async def run_day(day, session):
+        async with limit:
+            try:
+                links, articles, failed = await backfill_day(day, output_dir, session, max_per_day)
+            except Exception as e:
+                print(f"Backfill of {day} failed, it will be retried on the next run: {e}")
+                return
+        if failed:
+            print(f"{day}: {failed}/{links} article fetches failed, the day will be retried on the next run")
+            return
+        if links:
+            totals["days"] += 1
+            totals["links"] += links
+            totals["articles"] += articles
+        print(f"{day}: {articles}/{links} articles, {totals['days']}/{len(pending)} days done "
+              f"in {time.monotonic() - started:.0f}s")
+
+    async with borrowed_session() as session:
+        await asyncio.gather(*[run_day(day, session) for day in pending])
+
+    print(f"Backfill finished: {totals}")
+    print(f"Rate limits per domain: {rate_limit_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill Times of India archive articles into Parquet files.")
+    parser.add_argument("--start", required=True, type=date.fromisoformat, help="first day, YYYY-MM-DD")
+    parser.add_argument("--end", required=True, type=date.fromisoformat, help="last day, YYYY-MM-DD")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--days-concurrency", type=int, default=DAY_CONCURRENCY)
+    parser.add_argument("--rate", type=float, help="requests per second to timesofindia.indiatimes.com")
+    parser.add_argument("--burst", type=int)
+    parser.add_argument("--max-per-day", type=int, help="only the first N articles of each day")
+    args = parser.parse_args()
+
+    if args.rate:
+        set_rate(ARCHIVE_URL, args.rate, args.burst)
+    asyncio.run(backfill(args.start, args.end, args.output_dir, args.days_concurrency, args.max_per_day))
@@ -1,10 +1,9 @@
-import requests
-from bs4 import BeautifulSoup
+import aiohttp
+import asyncio
+from scrapers.html_parser import parse_html
 from datetime import datetime
-import nltk
-
-# Download necessary NLTK resources
-nltk.download('punkt_tab')
+from scrapers.http_session import borrowed_session
+from scrapers.rate_limit import acquire, record_response
 
 # Function to categorize the news based on keywords
 def categorize_news(headline, content):
@@ -45,17 +44,21 @@ def calculate_starttime(base_starttime, date):
     return base_starttime + delta.days
 
 # Function to fetch and parse the news articles for a specific date
-def fetch_news(year, month, day, starttime):
+async def fetch_news(year, month, day, starttime, session: aiohttp.ClientSession = None):
     archive_url = f'https://timesofindia.indiatimes.com/{year}/{month}/{day}/archivelist/year-{year},month-{month},starttime-{starttime}.cms'
     print(f"Fetching news for {day}/{month}/{year} from URL: {archive_url}")
     try:
-        response = requests.get(archive_url)
-        response.raise_for_status()  # Raise an exception for HTTP errors
-    except requests.exceptions.RequestException as e:
+        async with borrowed_session(session) as session:
+            await acquire(archive_url)
+            async with session.get(archive_url) as response:
+                record_response(archive_url, response.status, response.headers.get("Retry-After"))
+                response.raise_for_status()  # Raise an exception for HTTP errors
+                html = await response.text()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         print(f"Error fetching URL {archive_url}: {e}")
         return []
 
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = parse_html(html)
     span_tags = soup.find_all('span', style="font-family:arial ;font-size:12;color: #006699")
     if not span_tags:
         print(f"No articles found for {day}/{month}/{year}.")
@@ -68,15 +71,17 @@ def fetch_news(year, month, day, starttime):
                 continue
             if article_url.startswith('/'):
                 article_url = f"https://timesofindia.indiatimes.com{article_url}"
-                news_list.add(article_url)
+            news_list.add(article_url)
     
     print(len(news_list), "new articles found for", day, month, year)
     return list(news_list)
 
 
 base_starttime = 40179
-start_year = 2025
-start_month = 2
-start_day = 19
-current_date = datetime(start_year, start_month, start_day)
-links = fetch_news(2025, 2, 19, calculate_starttime(base_starttime, current_date))
\ No newline at end of file
+
+if __name__ == "__main__":
+    start_year = 2025
+    start_month = 2
+    start_day = 19
+    current_date = datetime(start_year, start_month, start_day)
+    links = asyncio.run(fetch_news(2025, 2, 19, calculate_starttime(base_starttime, current_date)))
\ No newline at end of file
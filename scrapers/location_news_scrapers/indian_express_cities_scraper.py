@@ -1,91 +1,108 @@
+import time
 import aiohttp
-import asyncio
-from datetime import datetime
-from bs4 import BeautifulSoup
+import difflib
+from scrapers.engine import scrape_site, fetch_page
+from scrapers.html_parser import parse_html
+from scrapers.article_store import default_store
+from scrapers.http_session import borrowed_session
+from scrapers.latest_news_scrapers.indian_express_scraper import ARTICLE_SELECTORS
 
 URL = "https://indianexpress.com/section/cities/"
 
-async def indian_express_cities_scraper(url: str = URL, max_articles: int = 5, location: list = ["delhi"]) -> list:
-    async with aiohttp.ClientSession() as session:
+# The city -> section URL map read from the cities submenu is reused for this many seconds
+CITY_MAP_TTL = 24 * 3600
+# A stale or built-in map, used because the submenu couldn't be read, is retried after this many seconds
+CITY_MAP_RETRY = 300
+CITY_MAP_KEY = "Indian Express (City)|city sections"
+
+# Used until the submenu has been read once
+CITIES = ["delhi", "mumbai", "pune", "kolkata", "chennai", "bangalore", "hyderabad", "ahmedabad",
+          "lucknow", "chandigarh", "ludhiana"]
+
+# Names users may give for the same city, whichever one the submenu uses
+ALIASES = [
+    ["delhi", "new delhi", "ncr"],
+    ["mumbai", "bombay", "navi mumbai"],
+    ["kolkata", "calcutta"],
+    ["chennai", "madras"],
+    ["bangalore", "bengaluru"],
+    ["pune", "poona"],
+    ["gurgaon", "gurugram"],
+    ["thiruvananthapuram", "trivandrum"],
+]
+
+# City pages scraped when the requested location has no section of its own
+FALLBACK_CITIES = 2
+
+_city_map = {"cities": None, "expires_at": 0}
+
+
+def city_pages(soup, url: str) -> list:
+    # The first submenu entry is the cities overview itself
+    names = [a.text.strip().lower().replace(' ', '-') for a in soup.select("ul.page_submenu a[href]")][1:]
+    return [(url + name + '/', name) for name in names if name]
+
+
+async def city_sections(url: str = URL, session: aiohttp.ClientSession = None) -> dict:
+    """Returns the city -> section URL map, re-read from the cities submenu once it is older than CITY_MAP_TTL."""
+    if _city_map["cities"] and time.time() < _city_map["expires_at"]:
+        return _city_map["cities"]
+
+    store = default_store()
+    # Shared through the article store with the other processes, e.g. the scrape workers
+    pages = store.get_links(CITY_MAP_KEY, max_age=CITY_MAP_TTL)
+    ttl = CITY_MAP_TTL
+    if pages is None:
         try:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    print(f"Failed to retrieve page, status code: {response.status}")
-                    return []
-                
-                html = await response.text()
-                news = []
-                print("Searching for location based news on Indian Express...")
-                
-                soup = BeautifulSoup(html, "html.parser")
-                target_ul = soup.find("ul", class_="page_submenu")
-                cities_url = [url + (str(a.text).lower()) + '/' for a in target_ul.find_all("a", href=True)]
-                cities_url = cities_url[1:]
-                
-                for city_url in cities_url:
-                    try:
-                        async with session.get(city_url, timeout=10) as city_response:
-                            if city_response.status == 200:
-                                city_html = await city_response.text()
-                                city_soup = BeautifulSoup(city_html, "html.parser")
-                                new_div = city_soup.find("div", id="north-east-data")
-                                if not new_div:
-                                    continue
-                                    
-                                news_links = [a["href"] for a in new_div.find_all("a", href=True)]
-                                news_links = list(set(news_links))
-                                news_links = news_links[:min(2 * max_articles, len(news_links))]
-                                
-                                cnt = 0
-                                for link in news_links:
-                                    try:
-                                        async with session.get(link, timeout=10) as link_response:
-                                            if link_response.status == 200:
-                                                link_html = await link_response.text()
-                                                link_soup = BeautifulSoup(link_html, "html.parser")
-                                                
-                                                headline = link_soup.find("h1", itemprop="headline")
-                                                title = headline.text if headline else "No title found"
-                                                
-                                                date_time_element = link_soup.find("span", itemprop="dateModified")
-                                                date_time = date_time_element["content"] if date_time_element else "No date found"
-                                                if date_time != "No date found":
-                                                    date_time = datetime.fromisoformat(date_time)
-                                                
-                                                content_div = link_soup.find("div", id="pcl-full-content")
-                                                if content_div:
-                                                    paragraphs = content_div.find_all("p")
-                                                    full_content = "\n".join(p.get_text(strip=True) for p in paragraphs)
-                                                else:
-                                                    continue
-                                                
-                                                news.append({"title": title, "date_time": date_time, "content": full_content, "location": city_url.split('/')[-2]})
-                                                cnt += 1
-                                                if cnt >= max_articles:
-                                                    break
-                                                
-                                            else:
-                                                print(f"Failed to retrieve page, status code: {link_response.status}")
-                                                continue
-                                    except asyncio.TimeoutError:
-                                        print(f"Timeout error for {link}")
-                                        continue
-                                    except Exception as e:
-                                        print(f"Error processing {link}: {e}")
-                                        continue
-                            else:
-                                print(f"Failed to retrieve page, status code: {city_response.status}")
-                                continue
-                    except asyncio.TimeoutError:
-                        print(f"Timeout error for {city_url}")
-                        continue
-                    except Exception as e:
-                        print(f"Error processing {city_url}: {e}")
-                        continue
-                        
+            async with borrowed_session(session) as session:
+                html = await fetch_page(session, url)
+            pages = city_pages(parse_html(html), url) if html else []
         except Exception as e:
-            print(f"Error getting the response from {url}: {e}")
-            return []
-    
-    print("Scraping complete. Total articles scraped:", len(news))
-    return news
\ No newline at end of file
+            print(f"Error refreshing the Indian Express city sections: {e}")
+            pages = []
+        if pages:
+            store.put_links(CITY_MAP_KEY, pages)
+        else:
+            # Keep whatever map we had, however old, rather than walking every city
+            pages = store.get_links(CITY_MAP_KEY, max_age=float("inf")) or [(url + city + '/', city) for city in CITIES]
+            ttl = CITY_MAP_RETRY
+
+    _city_map["cities"] = {city: section_url for section_url, city in pages}
+    _city_map["expires_at"] = time.time() + ttl
+    return _city_map["cities"]
+
+
+def match_city(user_city: str, cities: list) -> str:
+    """Finds the section for a user-provided city: by name, by alias, then by close spelling."""
+    name = user_city.strip().lower()
+    names = next((group for group in ALIASES if name in group), [name])
+    for candidate in [name, *names]:
+        if candidate.replace(' ', '-') in cities:
+            return candidate.replace(' ', '-')
+    match = difflib.get_close_matches(name.replace(' ', '-'), cities, n=1, cutoff=0.8)
+    return match[0] if match else None
+
+
+async def resolve_location(base_url: str, location: list, session: aiohttp.ClientSession = None) -> list:
+    """Points the scraper at the requested city's section only, or at a few cities when it has none."""
+    sections = await city_sections(base_url, session)
+    city = match_city(location[0], list(sections)) if location else None
+    if city:
+        return [{"urls": [sections[city]], "location": city}]
+    print(f"No Indian Express section for '{location}', scraping {FALLBACK_CITIES} cities instead")
+    return [{"urls": [section_url], "location": city} for city, section_url in list(sections.items())[:FALLBACK_CITIES]]
+
+
+SPEC = {
+    "name": "Indian Express (City)",
+    "kind": "location",
+    "index_url": URL,
+    "resolve_location": resolve_location,
+    "link_selector": "div#north-east-data a[href]",
+    **ARTICLE_SELECTORS,
+    "timeout": 10,
+}
+
+
+async def indian_express_cities_scraper(url: str = URL, max_articles: int = 5, location: list = ["delhi"], session: aiohttp.ClientSession = None) -> list:
+    return await scrape_site(SPEC, max_articles, location=location, index_url=url, session=session)
@@ -0,0 +1,29 @@
+"""
+Debug helpers that report when a callback holds
+the scraping event loop for too long.
+"""
+import os
+import asyncio
+import logging
+
+# Set SCRAPER_DEBUG_LOOP=1 to log every callback that stalls the loop
+DEBUG_LOOP = os.getenv("SCRAPER_DEBUG_LOOP", "0") == "1"
+STALL_THRESHOLD_MS = int(os.getenv("SCRAPER_STALL_THRESHOLD_MS", "100"))
+
+
+def enable_stall_detector(loop: asyncio.AbstractEventLoop, threshold_ms: int = STALL_THRESHOLD_MS):
+    """
+    Puts the loop in asyncio debug mode, which logs a warning naming the
+    callback or task step whenever one runs longer than `threshold_ms`.
+    Blocking calls such as `requests.get` inside a coroutine show up here.
+    """
+    loop.set_debug(True)
+    loop.slow_callback_duration = threshold_ms / 1000
+
+    # asyncio reports slow callbacks through its own logger at WARNING level
+    asyncio_logger = logging.getLogger("asyncio")
+    asyncio_logger.setLevel(logging.WARNING)
+    if not logging.getLogger().handlers and not asyncio_logger.handlers:
+        asyncio_logger.addHandler(logging.StreamHandler())
+
+    print(f"Event loop stall detector enabled (threshold {threshold_ms} ms)")
@@ -0,0 +1,71 @@
+"""
+Process pool for the CPU-bound part of scraping: parsing article HTML
+and joining its text. Running it on the event loop stalls every other
+fetch in flight, so the engine hands the raw HTML to a worker process
+and only gets the small article record back.
+
+Submissions go through a bounded queue: at most QUEUE_SIZE documents
+are waiting in or for the pool, further callers wait their turn instead
+of piling HTML up in memory. SCRAPER_PARSE_WORKERS=0 parses inline on
+the loop.
+"""
+import os
+import time
+import atexit
+import asyncio
+import weakref
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+PARSE_WORKERS = int(os.getenv("SCRAPER_PARSE_WORKERS", str(max(1, min(4, (os.cpu_count() or 2) - 1)))))
+QUEUE_SIZE = int(os.getenv("SCRAPER_PARSE_QUEUE", str(4 * max(PARSE_WORKERS, 1))))
+
+_executor = None
+
+# Semaphores are bound to an event loop, so keep one per loop
+_queue_slots = weakref.WeakKeyDictionary()
+
+
+def _timed(fn, *args):
+    """Runs in the worker, returns the result with the CPU seconds it took."""
+    start = time.thread_time()
+    result = fn(*args)
+    return result, time.thread_time() - start
+
+
+def executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # Spawned workers don't inherit the browser, the loop thread or the models of the app
+        _executor = ProcessPoolExecutor(PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+async def run_parser(fn, *args) -> tuple:
+    """
+    Runs `fn(*args)` in the parse pool and returns (result, cpu_seconds).
+    `fn` and its arguments must be picklable: module-level functions and plain data.
+    Falls back to running inline when the pool is disabled or broken.
+    """
+    if PARSE_WORKERS <= 0:
+        return _timed(fn, *args)
+
+    loop = asyncio.get_running_loop()
+    slots = _queue_slots.setdefault(loop, asyncio.Semaphore(QUEUE_SIZE))
+    async with slots:
+        try:
+            return await loop.run_in_executor(executor(), _timed, fn, *args)
+        except BrokenProcessPool:
+            print("Parse pool: a worker died, restarting the pool")
+            shutdown()
+            return _timed(fn, *args)
+
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+atexit.register(shutdown)
@@ -0,0 +1,152 @@
+"""
+Per-domain politeness limits for every request the scrapers make.
+
+Each registered domain (news18.com, indianexpress.com, ...) gets a token
+bucket shared by the HTTP fetches and the browser navigations: up to
+BURST requests go out back to back, after that at most RATE per second.
+A 429 or 503 empties the bucket, blocks the domain for its Retry-After
+and halves the rate, which then creeps back up with every successful
+response. Short Retry-After waits are retried once.
+"""
+import os
+import time
+import asyncio
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+RATE = float(os.getenv("SCRAPER_RATE_LIMIT", "2"))
+BURST = int(os.getenv("SCRAPER_RATE_BURST", "5"))
+
+THROTTLE_STATUSES = (429, 503)
+# Seconds to back off when a throttling response has no usable Retry-After
+DEFAULT_RETRY_AFTER = 10
+# Longer Retry-After waits are still honoured, but the request isn't retried
+MAX_RETRY_WAIT = 15
+RETRIES = 1
+
+MIN_RATE = 0.2
+# Requests per second won back with every successful response after throttling
+RATE_RECOVERY = 0.05
+
+# Second-level labels under which domains are registered, as in example.co.in
+_SECOND_LEVEL = {"co", "com", "net", "org", "gov", "ac", "edu", "nic"}
+
+
+def registered_domain(url: str) -> str:
+    """Returns the domain a URL is registered under, so sports.ndtv.com and www.ndtv.com share a bucket."""
+    host = urlparse(url).hostname or ""
+    labels = host.split(".")
+    if labels[-1].isdigit() or ":" in host:
+        return host
+    if len(labels) > 2 and labels[-2] in _SECOND_LEVEL and len(labels[-1]) == 2:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def retry_after_seconds(value) -> float:
+    """Parses a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return DEFAULT_RETRY_AFTER
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+class TokenBucket:
+    def __init__(self, rate: float = RATE, burst: int = BURST):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.counters = {"requests": 0, "throttled": 0, "waited_s": 0.0}
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Waits until the domain may be sent another request and takes a token."""
+        start = time.monotonic()
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                break
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+        self.counters["requests"] += 1
+        self.counters["waited_s"] += time.monotonic() - start
+
+    def throttle(self, delay: float):
+        now = time.monotonic()
+        self.blocked_until = max(self.blocked_until, now + delay)
+        self.tokens = 0.0
+        self.updated = now
+        self.rate = max(MIN_RATE, self.rate / 2)
+        self.counters["throttled"] += 1
+
+    def recover(self):
+        self.rate = min(self.max_rate, self.rate + RATE_RECOVERY)
+
+
+_buckets = {}
+
+
+def bucket(url: str) -> TokenBucket:
+    domain = registered_domain(url)
+    if domain not in _buckets:
+        _buckets[domain] = TokenBucket()
+    return _buckets[domain]
+
+
+def set_rate(url: str, rate: float, burst: int = None):
+    """Overrides the politeness limit of the domain of `url`, e.g. for a bulk job against one site."""
+    domain = registered_domain(url)
+    _buckets[domain] = TokenBucket(rate, burst or BURST)
+
+
+async def acquire(url: str):
+    """Waits for the politeness limit of the domain of `url`."""
+    await bucket(url).acquire()
+
+
+def record_response(url: str, status: int, retry_after=None) -> bool:
+    """
+    Feeds a response status back into the domain's bucket. Returns True when
+    it was throttled and the wait is short enough for the request to be retried.
+    """
+    if status not in THROTTLE_STATUSES:
+        bucket(url).recover()
+        return False
+    delay = retry_after_seconds(retry_after)
+    print(f"Throttled by {registered_domain(url)} ({status}), backing off for {delay:.0f}s")
+    bucket(url).throttle(delay)
+    return delay <= MAX_RETRY_WAIT
+
+
+async def goto(page, url: str, **kwargs):
+    """`page.goto` under the domain's politeness limit, retried once after a short Retry-After."""
+    for attempt in range(RETRIES + 1):
+        await acquire(url)
+        response = await page.goto(url, **kwargs)
+        if response is None:
+            return response
+        retry = record_response(url, response.status, response.headers.get("retry-after"))
+        if not retry or attempt == RETRIES:
+            return response
+
+
+def rate_limit_stats() -> dict:
+    """Returns the current rate, requests, throttling responses and time spent waiting per domain."""
+    return {domain: {**b.counters, "waited_s": round(b.counters["waited_s"], 1), "rate": round(b.rate, 2)}
+            for domain, b in _buckets.items()}
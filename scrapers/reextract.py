@@ -0,0 +1,86 @@
+"""
+Re-runs the current extractors over the stored raw HTML snapshots, in
+parallel and without any network access. After a selector fix this
+refreshes the article store, or writes the articles out for relabelling,
+instead of re-crawling every site.
+
+Usage:
+    python -m scrapers.reextract --store
+    python -m scrapers.reextract --sources "News18 (City)" "News18 (Topic)" --output news18.jsonl --label
+"""
+import os
+import json
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from scrapers.engine import EXTRACTION_KEYS, extract_article
+from scrapers.snapshots import SNAPSHOT_DIR, SnapshotStore, read_snapshot
+from scrapers.article_store import default_store
+from scrapers.registry import SPECS
+
+
+def extract_snapshot(path: str, extraction: dict, url: str) -> dict:
+    """Runs in a worker: decompresses one snapshot and extracts its article."""
+    return extract_article(extraction, read_snapshot(path), url)
+
+
+def reextract(store: SnapshotStore, sources: list = None, workers: int = None) -> list:
+    """Returns (url, source, article) for every snapshot, article is None when extraction came back empty."""
+    jobs = []
+    for url, source, path in store.entries(sources):
+        if source not in SPECS:
+            print(f"Skipping {url}: no scraper named '{source}' anymore")
+            continue
+        extraction = {key: SPECS[source][key] for key in EXTRACTION_KEYS if key in SPECS[source]}
+        jobs.append((url, source, path, extraction))
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context) as executor:
+        futures = [(url, source, executor.submit(extract_snapshot, path, extraction, url))
+                   for url, source, path, extraction in jobs]
+        for url, source, future in futures:
+            try:
+                results.append((url, source, future.result()))
+            except Exception as e:
+                print(f"Error re-extracting {url} ({source}): {e}")
+                results.append((url, source, None))
+    return results
+
+
+def write_jsonl(results: list, path: str, label: bool = False):
+    predict_category = None
+    if label:
+        from bert_labelling import predict_category
+    with open(path, "w", encoding="utf-8") as f:
+        for url, source, article in results:
+            if not article:
+                continue
+            record = {"url": url, "source": source, **article, "date_time": str(article["date_time"])}
+            if predict_category:
+                record["news_label"] = predict_category(article["content"].strip())
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-extract articles from stored HTML snapshots, offline.")
+    parser.add_argument("--snapshot-dir", default=SNAPSHOT_DIR or "snapshots")
+    parser.add_argument("--sources", nargs="+", help="only these scraper names, e.g. 'News18 (City)'")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--store", action="store_true", help="write the articles back to the article store")
+    parser.add_argument("--output", help="write the articles to this JSONL file")
+    parser.add_argument("--label", action="store_true", help="add BERT news labels to the JSONL output")
+    args = parser.parse_args()
+
+    results = reextract(SnapshotStore(args.snapshot_dir), args.sources, args.workers)
+    extracted = [result for result in results if result[2]]
+    print(f"Re-extracted {len(extracted)} of {len(results)} snapshots")
+
+    if args.store:
+        store = default_store()
+        for url, source, article in extracted:
+            store.put(url, source, article)
+        print(f"Article store: {store.stats()}")
+    if args.output:
+        write_jsonl(results, args.output, args.label)
+        print(f"Wrote {args.output}")
@@ -0,0 +1,15 @@
+"""
+Every scraper spec, by source name, for code that receives a source by
+name: the scrape workers and the offline re-extraction.
+"""
+from scrapers.latest_news_scrapers import india_tv_scraper, indian_express_scraper, mint_scraper, ndtv_scraper, news18_scraper, sportskeeda
+from scrapers.location_news_scrapers import india_tv_cities_scraper, indian_express_cities_scraper, ndtv_city_scraper, news18city, tribuneindiacity
+from scrapers.topic_news_scrapers import indianexpress, livemint, ndtv, news18, tribuneindia
+
+SCRAPER_MODULES = [
+    india_tv_scraper, indian_express_scraper, mint_scraper, ndtv_scraper, news18_scraper, sportskeeda,
+    india_tv_cities_scraper, indian_express_cities_scraper, ndtv_city_scraper, news18city, tribuneindiacity,
+    indianexpress, livemint, ndtv, news18, tribuneindia,
+]
+
+SPECS = {module.SPEC["name"]: module.SPEC for module in SCRAPER_MODULES}
@@ -0,0 +1,75 @@
+"""
+Request blocking for the browser contexts of the browser pool.
+
+Every context gets one route, installed before its first page navigates,
+that aborts the resource types the scrapers never need and any request to
+ad, analytics and tracking domains. Specs can adjust it per source:
+
+    blocked_resources   resource types to abort, default BLOCKED_RESOURCES
+    blocked_domains     domains to block on top of BLOCKED_DOMAINS
+    allowed_domains     domains to let through even though BLOCKED_DOMAINS lists them
+
+Sources with the same settings share a browser context.
+"""
+import os
+from collections import defaultdict
+from urllib.parse import urlparse
+
+# Resource types the browser never downloads unless a spec says otherwise
+BLOCKED_RESOURCES = ["image", "stylesheet", "font", "media"]
+
+# Third-party ad, analytics and tracking domains, subdomains included
+BLOCKED_DOMAINS = [
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com", "googletagmanager.com",
+    "googletagservices.com", "google-analytics.com", "adservice.google.com", "amazon-adsystem.com",
+    "adnxs.com", "criteo.com", "criteo.net", "pubmatic.com", "rubiconproject.com", "openx.net",
+    "taboola.com", "outbrain.com", "mgid.com", "moatads.com", "scorecardresearch.com", "quantserve.com",
+    "chartbeat.com", "chartbeat.net", "hotjar.com", "clarity.ms", "facebook.net", "connect.facebook.net",
+    "izooto.com", "onesignal.com", "nr-data.net",
+] + [domain.strip() for domain in os.getenv("SCRAPER_BLOCKED_DOMAINS", "").split(",") if domain.strip()]
+
+# Requests aborted per reason, the resource type or the blocked domain
+blocked_counts = defaultdict(int)
+
+
+def blocking_policy(spec: dict = None) -> tuple:
+    """The blocking settings of a spec, as a hashable key. No spec gets the defaults."""
+    spec = spec or {}
+    domains = set(BLOCKED_DOMAINS) | set(spec.get("blocked_domains", []))
+    domains -= set(spec.get("allowed_domains", []))
+    return frozenset(spec.get("blocked_resources", BLOCKED_RESOURCES)), frozenset(domains)
+
+
+def blocked_domain(url: str, domains: frozenset) -> str:
+    """Returns the entry of `domains` that `url` falls under, None when it isn't blocked."""
+    host = urlparse(url).hostname or ""
+    for domain in domains:
+        if host == domain or host.endswith("." + domain):
+            return domain
+    return None
+
+
+def block_reason(policy: tuple, resource_type: str, url: str) -> str:
+    """Why a request is blocked under `policy`, None when it may go through."""
+    resource_types, domains = policy
+    if resource_type in resource_types:
+        return resource_type
+    return blocked_domain(url, domains)
+
+
+async def install_blocking(context, policy: tuple):
+    """Aborts the requests `policy` blocks for every page of `context`, current and future."""
+    async def handle(route):
+        reason = block_reason(policy, route.request.resource_type, route.request.url)
+        if reason:
+            blocked_counts[reason] += 1
+            await route.abort()
+        else:
+            # Lets routes registered earlier, like the HTTP archive replay, handle the request
+            await route.fallback()
+
+    await context.route("**/*", handle)
+
+
+def blocking_stats() -> dict:
+    return dict(blocked_counts)
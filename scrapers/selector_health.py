@@ -0,0 +1,87 @@
+"""
+Per-source selector-miss tracking, to catch sites whose markup drifted.
+
+Rendered pages are checked for the selectors the extraction needs in a
+single DOM evaluation right after domcontentloaded, and abandoned at
+once when one is missing instead of waiting out a selector timeout.
+Static pages count as misses when their article or link selectors match
+nothing. After MISS_ALERT consecutive misses a source is reported as
+drifted, and its index pages stop waiting for selectors that are absent,
+except for one full wait every PROBE_INTERVAL seconds, which lets the
+source recover once a page matches again.
+"""
+import os
+import time
+from collections import defaultdict
+
+MISS_ALERT = int(os.getenv("SCRAPER_SELECTOR_MISS_ALERT", "5"))
+
+# Seconds between the full selector waits still let through for a drifted source
+PROBE_INTERVAL = 60
+
+# Returns the selectors that match nothing on the page
+MISSING_SELECTORS_JS = "selectors => selectors.filter(selector => !document.querySelector(selector))"
+
+
+class SelectorHealth:
+    def __init__(self):
+        self.misses = 0
+        self.hits = 0
+        self.streak = 0
+        self.missing = set()
+        self.alerts = 0
+        self.probed_at = float("-inf")
+
+
+_sources = defaultdict(SelectorHealth)
+
+
+async def missing_selectors(page, selectors: list) -> list:
+    """Returns which of `selectors` match nothing on `page`, in one round trip to the browser."""
+    selectors = [selector for selector in selectors if isinstance(selector, str)]
+    if not selectors:
+        return []
+    return await page.evaluate(MISSING_SELECTORS_JS, selectors)
+
+
+def record_selectors(source: str, missing: list):
+    """Records whether a page of `source` had all its selectors, alerting once a streak of misses reaches MISS_ALERT."""
+    health = _sources[source]
+    if not missing:
+        if health.streak >= MISS_ALERT:
+            print(f"Selectors of {source} match again after {health.streak} misses")
+        health.hits += 1
+        health.streak = 0
+        health.missing.clear()
+        return
+
+    health.misses += 1
+    health.streak += 1
+    health.missing.update(missing)
+    if health.streak == MISS_ALERT:
+        health.alerts += 1
+        print(f"⚠️ ALERT: {source} selectors missing on {health.streak} pages in a row, "
+              f"its markup probably changed: {sorted(health.missing)}")
+
+
+def drifted(source: str) -> bool:
+    """True while the last MISS_ALERT or more pages of `source` missed their selectors."""
+    return _sources[source].streak >= MISS_ALERT
+
+
+def probe_due(source: str) -> bool:
+    """True once per PROBE_INTERVAL for a drifted source, for a full wait that can end its streak."""
+    health = _sources[source]
+    if time.monotonic() - health.probed_at < PROBE_INTERVAL:
+        return False
+    health.probed_at = time.monotonic()
+    return True
+
+
+def selector_stats() -> dict:
+    """Returns per-source selector hits, misses, the current streak of misses and the selectors missing in it."""
+    return {
+        source: {"hits": health.hits, "misses": health.misses, "streak": health.streak,
+                 "drifted": health.streak >= MISS_ALERT, "missing": sorted(health.missing), "alerts": health.alerts}
+        for source, health in _sources.items()
+    }
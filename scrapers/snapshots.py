@@ -0,0 +1,114 @@
+"""
+Content-addressed snapshots of the raw article HTML the scrapers fetch.
+
+With SCRAPER_SNAPSHOT_DIR set, every article page handed to an extractor
+is saved zstd-compressed as blobs/<sha[:2]>/<sha>.html.zst, named after
+the SHA-256 of its HTML, so an unchanged page is stored once however
+often it is fetched. index.sqlite3 maps each (url, source) to its latest
+snapshot. `python -m scrapers.reextract` re-runs the current extractors
+over the snapshots without any network access.
+"""
+import os
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+
+SNAPSHOT_DIR = os.getenv("SCRAPER_SNAPSHOT_DIR", "")
+ZSTD_LEVEL = 6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    url TEXT NOT NULL,
+    source TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (url, source)
+);
+"""
+
+
+def read_snapshot(path: str) -> str:
+    """Returns the HTML of a snapshot blob."""
+    import zstandard
+    with open(path, "rb") as f:
+        return zstandard.ZstdDecompressor().decompress(f.read()).decode("utf-8")
+
+
+class SnapshotStore:
+    """Snapshot blobs plus their SQLite index, safe to share between threads."""
+
+    def __init__(self, directory: str = SNAPSHOT_DIR):
+        self.directory = directory
+        self.counters = {"saved": 0, "deduplicated": 0, "bytes_raw": 0, "bytes_stored": 0}
+        os.makedirs(os.path.join(directory, "blobs"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, "index.sqlite3"), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "blobs", digest[:2], digest + ".html.zst")
+
+    def save(self, url: str, source: str, html: str) -> str:
+        """Stores the HTML of `url` as fetched for `source`, returns its digest."""
+        import zstandard
+        raw = html.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self.blob_path(digest)
+        if os.path.exists(path):
+            self.counters["deduplicated"] += 1
+        else:
+            compressed = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                f.write(compressed)
+            os.replace(path + ".tmp", path)
+            self.counters["saved"] += 1
+            self.counters["bytes_raw"] += len(raw)
+            self.counters["bytes_stored"] += len(compressed)
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO snapshots (url, source, digest, fetched_at) VALUES (?, ?, ?, ?)",
+                (url, source, digest, time.time()),
+            )
+        return digest
+
+    def entries(self, sources: list = None) -> list:
+        """Returns (url, source, blob path) of the latest snapshot of every page, optionally for some sources only."""
+        with self._lock:
+            rows = self._db.execute("SELECT url, source, digest FROM snapshots ORDER BY source, url").fetchall()
+        return [(url, source, self.blob_path(digest)) for url, source, digest in rows
+                if not sources or source in sources]
+
+    def stats(self) -> dict:
+        return dict(self.counters)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_default_snapshots = None
+_default_snapshots_lock = threading.Lock()
+
+
+def default_snapshots() -> SnapshotStore:
+    """Returns the process-wide snapshot store, opened on first use."""
+    global _default_snapshots
+    with _default_snapshots_lock:
+        if _default_snapshots is None:
+            _default_snapshots = SnapshotStore()
+    return _default_snapshots
+
+
+async def save_snapshot(source: str, url: str, html: str):
+    """Snapshots an article page when SCRAPER_SNAPSHOT_DIR is set, does nothing otherwise."""
+    if not SNAPSHOT_DIR or not html:
+        return
+    try:
+        await asyncio.to_thread(default_snapshots().save, url, source, html)
+    except Exception as e:
+        print(f"Failed to snapshot {url}: {e}")
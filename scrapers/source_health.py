@@ -0,0 +1,147 @@
+"""
+Per-source latency tracking, adaptive timeouts and circuit breakers.
+
+The engine records how long every network page load of a source takes.
+Timeouts are derived from the EWMA and p95 of those latencies instead of
+fixed values, so a slow site gets more room and a fast one fails fast.
+
+A source whose runs fail or come back empty FAILURE_THRESHOLD times in
+a row has its breaker opened and is skipped for COOL_DOWN seconds. After
+that a single trial run is let through (half-open), other runs are still
+skipped while it is in flight. It closes the breaker on success and
+re-opens it on failure.
+"""
+import os
+import time
+import contextvars
+from collections import defaultdict, deque
+
+FAILURE_THRESHOLD = int(os.getenv("SCRAPER_BREAKER_FAILURES", "3"))
+COOL_DOWN = int(os.getenv("SCRAPER_BREAKER_COOLDOWN", "300"))
+
+EWMA_ALPHA = 0.3
+LATENCY_WINDOW = 50
+# Fewer samples than this and the default timeouts are used
+MIN_SAMPLES = 5
+
+# A page may take this many times the usual page latency, a whole run this many page loads
+PAGE_TIMEOUT_FACTOR = 3
+RUN_TIMEOUT_FACTOR = 4
+MIN_PAGE_TIMEOUT = 5
+MIN_RUN_TIMEOUT = 10
+
+
+class SourceHealth:
+    def __init__(self):
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.ewma = None
+        self.failures = 0
+        self.state = "closed"
+        self.opened_at = None
+        self.trial_started_at = None
+        self.skipped = 0
+
+    def p95(self) -> float:
+        ordered = sorted(self.latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def typical_latency(self) -> float:
+        """Latency the timeouts scale from, None while there are too few samples."""
+        if len(self.latencies) < MIN_SAMPLES:
+            return None
+        return max(self.ewma, self.p95())
+
+
+_sources = defaultdict(SourceHealth)
+
+# When set, latencies recorded in the current context are also appended to this list,
+# which is how a scrape worker sends them back to the chat process with the job
+latency_log = contextvars.ContextVar("latency_log", default=None)
+
+
+def record_latency(source: str, seconds: float):
+    """Records how long one network page load (HTTP or browser) of `source` took."""
+    log = latency_log.get()
+    if log is not None:
+        log.append(seconds)
+    health = _sources[source]
+    health.latencies.append(seconds)
+    health.ewma = seconds if health.ewma is None else EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * health.ewma
+
+
+def page_timeout(source: str, default: float) -> float:
+    """Seconds to allow one page load of `source`, never more than `default`."""
+    latency = _sources[source].typical_latency()
+    if latency is None:
+        return default
+    return min(default, max(MIN_PAGE_TIMEOUT, PAGE_TIMEOUT_FACTOR * latency))
+
+
+def run_timeout(source: str, default: float) -> float:
+    """Seconds to allow a whole scraper run of `source`, never more than `default`."""
+    latency = _sources[source].typical_latency()
+    if latency is None:
+        return default
+    return min(default, max(MIN_RUN_TIMEOUT, RUN_TIMEOUT_FACTOR * PAGE_TIMEOUT_FACTOR * latency))
+
+
+def allow(source: str) -> bool:
+    """
+    False while the breaker of `source` is open. Once the cool-down is over it moves to
+    half-open and lets exactly one caller through, until that trial's outcome is recorded.
+    """
+    health = _sources[source]
+    if health.state == "closed":
+        return True
+    if health.state == "open" and time.time() - health.opened_at < COOL_DOWN:
+        health.skipped += 1
+        return False
+    # A trial that never reported, e.g. its process died, doesn't hold the breaker forever
+    if health.state == "half-open" and time.time() - health.trial_started_at < COOL_DOWN:
+        health.skipped += 1
+        return False
+    if health.state == "open":
+        print(f"Circuit breaker for {source} half-open, letting one trial run through")
+    health.state = "half-open"
+    health.trial_started_at = time.time()
+    return True
+
+
+def release_trial(source: str):
+    """Lets another caller make the half-open trial of `source`, when the trial ended without an outcome."""
+    health = _sources[source]
+    if health.state == "half-open":
+        health.state = "open"
+        health.opened_at = time.time() - COOL_DOWN
+
+
+def record_outcome(source: str, ok: bool):
+    """Records whether a scraper run produced articles, opening or closing the breaker."""
+    health = _sources[source]
+    if ok:
+        if health.state != "closed":
+            print(f"Circuit breaker for {source} closed again")
+        health.failures = 0
+        health.state = "closed"
+        return
+
+    health.failures += 1
+    if health.state == "half-open" or (health.state == "closed" and health.failures >= FAILURE_THRESHOLD):
+        health.state = "open"
+        health.opened_at = time.time()
+        print(f"Circuit breaker for {source} opened after {health.failures} failed runs, skipping it for {COOL_DOWN}s")
+
+
+def health_stats() -> dict:
+    """Returns breaker state, latency EWMA / p95 and the current timeouts of every source."""
+    stats = {}
+    for source, health in _sources.items():
+        stats[source] = {
+            "state": health.state,
+            "failures": health.failures,
+            "skipped": health.skipped,
+            "ewma_s": round(health.ewma, 2) if health.ewma is not None else None,
+            "p95_s": round(health.p95(), 2) if health.latencies else None,
+            "page_timeout_s": round(page_timeout(source, float("inf")), 1) if health.typical_latency() else None,
+        }
+    return stats
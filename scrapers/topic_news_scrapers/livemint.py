@@ -1,90 +1,39 @@
 import aiohttp
-import asyncio
-from datetime import datetime
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+from scrapers.engine import scrape_site
+from scrapers.browser_pool import BrowserPool
+from scrapers.latest_news_scrapers.mint_scraper import SPEC as LATEST_SPEC
 
 URL = "https://www.livemint.com/search"
 
-async def livemint_topic_scraper(url: str = URL, topics: list = [], max_articles: int = 5) -> list:
-    links = []
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.goto(url, timeout=30000, wait_until="domcontentloaded")
-        await page.route("**/*", lambda route: asyncio.create_task(
-            route.abort() if route.request.resource_type in ["image", "stylesheet", "font", "media"] else route.continue_()))
-
-        print("Searching for topic based news on Live Mint...")
-        for topic in topics:
-            print(f"Searching for: {topic}")
-
-            await page.fill("#searchField", topic)
-            await page.press("#searchField", "Enter")
-            await page.wait_for_selector(".listingNew", timeout=10000)
-
-            # Extract article links from 'h2.headline a'
-            topic_links = await page.eval_on_selector_all(
-                ".listingNew h2.headline a",
-                "elements => elements.map(el => el.href)"
-            )
-
-            await asyncio.sleep(2)
-            links.append((topic_links[:min(2 * max_articles, len(topic_links))], topic))
-
-        await browser.close()
-
-    news = []
-    async with aiohttp.ClientSession() as session:
-        for topic_links, topic in links:
-            cnt = 0
-            for url in topic_links:
-                try:
-                    async with session.get(url) as response:
-                        if response.status != 200:
-                            print(f"Failed to retrieve {url}, status code: {response.status}")
-                            continue
-                            
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-
-                        h1_tag = soup.find('h1', id="article-0")
-                        headh1_tag = soup.find('h1', class_="headline")
-                        
-                        if h1_tag:
-                            h1_text = h1_tag.get_text()
-
-                            first_published = soup.find('div', class_=lambda x: x and x.startswith('storyPage_date'))
-                            story_paras = soup.find_all('div', class_="storyParagraph", id=lambda x: x and x.startswith('article-index'))
-
-                        elif headh1_tag:
-                            h1_text = headh1_tag.get_text()
-
-                            first_published = soup.find('span', class_="articleInfo pubtime fl")
-                            story_paras = soup.find_all('div', class_="liveSecIntro")
-
-                        else:
-                            continue
-
-                        first_published_text = first_published.get_text(strip=True) if first_published else "No date found"
-                        for prefix in ["Updated", "Published"]:
-                            if first_published_text.startswith(prefix):
-                                dt = first_published_text.replace(prefix, "").replace("IST", "").replace(",", "").strip()
-                                date_time = datetime.strptime(dt, "%d %b %Y %I:%M %p")
-                            else:
-                                date_time = first_published_text
-
-                        story_texts = [para.get_text() for para in story_paras]
-                        article_text = ' '.join(story_texts)
-
-                        news.append({'title': h1_text, 'date_time': date_time, 'content': article_text})
-                        cnt += 1
-                        if cnt >= max_articles:
-                            break
-                        
-                except Exception as e:
-                    print(f"Error processing {url}: {e}")
-                    continue
-
-    print("Scraping complete. Total articles scraped:", len(news))
-    return news
\ No newline at end of file
+# Section feeds for the topics that have one, the others go through the search page
+FEED_URLS = {
+    "elections and politics": "https://www.livemint.com/rss/politics",
+    "sports": "https://www.livemint.com/rss/sports",
+    "science and technology": "https://www.livemint.com/rss/technology",
+    "business": "https://www.livemint.com/rss/companies",
+    "education": "https://www.livemint.com/rss/education",
+    "lifestyle and culture": "https://www.livemint.com/rss/lifestyle",
+}
+
+# Search results mix regular stories and live blogs, the second selector of each pair matches live blogs
+SPEC = {
+    **LATEST_SPEC,
+    "name": "Live Mint (Topic)",
+    "kind": "topic",
+    "index_url": URL,
+    "feed_url": FEED_URLS,
+    "render": True,
+    "index_actions": [
+        ("fill", "#searchField", "{topic}"),
+        ("press", "#searchField", "Enter"),
+        ("wait_for", ".listingNew"),
+    ],
+    "link_selector": ".listingNew h2.headline a",
+    "title_selector": "h1#article-0, h1.headline",
+    "date_selector": "div[class^='storyPage_date'], span.articleInfo.pubtime.fl",
+    "body_selector": "div.storyParagraph[id^='article-index'], div.liveSecIntro",
+    "render_timeout": 30000,
+}
+
+async def livemint_topic_scraper(url: str = URL, topics: list = [], max_articles: int = 5, pool: BrowserPool = None, session: aiohttp.ClientSession = None) -> list:
+    return await scrape_site(SPEC, max_articles, topics=topics, index_url=url, pool=pool, session=session)
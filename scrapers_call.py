@@ -3,83 +3,251 @@ This script is used to call the scrapers
 for the different websites as per 
 LLMs Response of User's Query.
 """
+import os
+import atexit
 import asyncio
+import threading
 import pandas as pd
 import chainlit as cl
+from concurrent.futures import ThreadPoolExecutor
 from bert_labelling import predict_category
 from process_user_query import find_location_in_user_query, normalize_topic_param
 from scrapers.latest_news_scrapers import india_tv_scraper, indian_express_scraper, ndtv_scraper, mint_scraper, news18_scraper, sportskeeda
 from scrapers.location_news_scrapers import india_tv_cities_scraper, ndtv_city_scraper, news18city, tribuneindiacity
 from scrapers.topic_news_scrapers import indianexpress, livemint, news18, tribuneindia
+from scrapers.browser_pool import BrowserPool
+from scrapers.engine import stream_site
+from scrapers.article_store import default_store
+from scrapers.http_cache import default_cache
+from scrapers.rate_limit import rate_limit_stats
+from scrapers.source_health import allow, record_outcome, release_trial, run_timeout, health_stats
+from scrapers.selector_health import selector_stats
+from scrapers.resource_blocking import blocking_stats
+from scrapers.fetch import fallback_stats, merge_streams, quota_stats
+from scrapers.http_session import HttpSessionManager
+from scrapers.job_queue import JOB_QUEUE, default_queue, queued_stream
+from scrapers.loop_monitor import DEBUG_LOOP, enable_stall_detector
 
 
+# Upper bound for one scraper run, the actual timeout adapts to each source's latency
 SCRAPER_TIMEOUT = 60
 
-# Wrapper for running each scraper safely
-async def run_scraper(name, scraper_fn):
-    try:
-        msg = cl.Message(content=f"⏳ Running `{name}` scraper...")
-        await msg.send()
+# Number of articles kept from each source, passed down to the scrapers as their quota
+ARTICLES_PER_SOURCE = 2
 
-        result = await asyncio.wait_for(scraper_fn, timeout=SCRAPER_TIMEOUT)
+# Overall deadline for a query in seconds, and the number of articles after which
+# to stop early. 0 disables either, partial results are returned when one is hit.
+SCRAPE_BUDGET = float(os.getenv("SCRAPER_BUDGET_SECONDS", "0"))
+SCRAPE_FIRST_K = int(os.getenv("SCRAPER_FIRST_K", "0"))
 
-        msg.content = f"✅ `{name}` completed. Scraped {len(result)} articles."
-        await msg.update()
-        return result
+# Columns of the frame scrape_and_process returns when no article came in
+ARTICLE_COLUMNS = ['title', 'date_time', 'content', 'location', 'news_label']
 
-    except asyncio.TimeoutError:
-        msg.content = f"⚠️ `{name}` timed out after {SCRAPER_TIMEOUT}s."
-        await msg.update()
-        return []
+# Wall time, articles and per-source timings of the last run_selected_scrapers call
+last_run = {}
 
-    except Exception as e:
-        msg.content = f"❌ `{name}` failed with error: {str(e)}"
-        await msg.update()
-        return []
+# BERT labelling runs on one worker thread, in parallel with the scraping still in flight
+LABEL_EXECUTOR = ThreadPoolExecutor(max_workers=1)
 
+# Process-wide browser pool, Playwright scrapers lease tabs from it
+BROWSER_POOL = BrowserPool()
 
-# Main function to run all selected scrapers based on user query
-async def run_selected_scrapers(query: dict) -> list:
-    raw_data = []
+# Process-wide aiohttp session, handed to every HTTP scraper
+HTTP_SESSION = HttpSessionManager()
+
+# The browser pool and HTTP session are bound to the event loop they were created on, so all
+# scraping runs on one long-lived loop instead of a fresh asyncio.run() per query
+_scraping_loop = None
+_scraping_loop_lock = threading.Lock()
+
+
+def get_scraping_loop() -> asyncio.AbstractEventLoop:
+    global _scraping_loop
+    with _scraping_loop_lock:
+        if _scraping_loop is None:
+            _scraping_loop = asyncio.new_event_loop()
+            if DEBUG_LOOP:
+                enable_stall_detector(_scraping_loop)
+            threading.Thread(target=_scraping_loop.run_forever, name="scraping-loop", daemon=True).start()
+    return _scraping_loop
+
+
+def run_in_scraping_loop(coro):
+    """Runs a coroutine on the shared scraping loop and blocks until it finishes."""
+    return asyncio.run_coroutine_threadsafe(coro, get_scraping_loop()).result()
+
+
+async def await_in_scraping_loop(coro):
+    """Runs a coroutine on the shared scraping loop and awaits it without blocking the caller's loop."""
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, get_scraping_loop()))
+
+
+async def on_ui_loop(coro, ui_loop: asyncio.AbstractEventLoop = None):
+    """
+    Awaits a Chainlit call on the chat's event loop, which owns the session's socket,
+    from the scraping loop. Without `ui_loop` it runs on the current loop.
+    """
+    if ui_loop is None or ui_loop is asyncio.get_running_loop():
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, ui_loop))
+
+
+def shutdown_scrapers():
+    """Closes the shared browser pool and HTTP session and stops the scraping loop."""
+    global _scraping_loop
+    if _scraping_loop is None:
+        return
+    run_in_scraping_loop(HTTP_SESSION.close())
+    run_in_scraping_loop(BROWSER_POOL.close())
+    print(f"Browser pool stats at shutdown: {BROWSER_POOL.stats()}")
+    _scraping_loop.call_soon_threadsafe(_scraping_loop.stop)
+    _scraping_loop = None
+
+atexit.register(shutdown_scrapers)
+
+# Status messages for each running scraper, updated as their streams finish
+async def start_progress(names: list, ui_loop: asyncio.AbstractEventLoop = None) -> dict:
+    messages = {}
+    for name in names:
+        messages[name] = cl.Message(content=f"⏳ Running `{name}` scraper...")
+        await on_ui_loop(messages[name].send(), ui_loop)
+    return messages
+
+
+def progress_reporter(messages: dict, timeouts: dict, cut_off: list, timings: dict, ui_loop: asyncio.AbstractEventLoop = None):
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def on_finish(name, count, error):
+        timings[name] = {"articles": count, "seconds": round(loop.time() - start, 2),
+                         "error": type(error).__name__ if error else None}
+        msg = messages[name]
+        if isinstance(error, asyncio.CancelledError):
+            # Stopped by the query deadline, which says nothing about the source's health
+            release_trial(name)
+            cut_off.append(name)
+            msg.content = f"✂️ `{name}` cut off by the deadline. Kept {count} articles."
+            await on_ui_loop(msg.update(), ui_loop)
+            return
+
+        # A run that produced nothing counts against the source's circuit breaker
+        record_outcome(name, count > 0)
+        if isinstance(error, asyncio.TimeoutError):
+            msg.content = f"⚠️ `{name}` timed out after {timeouts[name]:.0f}s. Kept {count} articles."
+        elif error:
+            msg.content = f"❌ `{name}` failed with error: {str(error)}"
+        else:
+            msg.content = f"✅ `{name}` completed. Scraped {count} articles."
+        await on_ui_loop(msg.update(), ui_loop)
+    return on_finish
+
+
+# Scraper specs selected by the user query, with the arguments to run them with
+def selected_sources(query: dict, quota: int = ARTICLES_PER_SOURCE) -> list:
+    sources = []
 
     # -------- Latest News --------
     if query.get('latest_news'):
-        if query['latest_news']:
-            latest_tasks = await asyncio.gather(
-                run_scraper("India TV", india_tv_scraper.india_tv_news_scraper()),
-                run_scraper("Indian Express", indian_express_scraper.indian_express_scraper()),
-                run_scraper("NDTV", ndtv_scraper.ndtv_scraper()),
-                run_scraper("Livemint", mint_scraper.livemint_scraper()),
-                run_scraper("News18", news18_scraper.news18_scraper()),
-                run_scraper("Sportskeeda", sportskeeda.sportskeeda_scraper())
-            )
-            for news in latest_tasks:
-                raw_data.extend(news[:2])
+        for module in [india_tv_scraper, indian_express_scraper, ndtv_scraper, mint_scraper, news18_scraper, sportskeeda]:
+            sources.append((module.SPEC, {"max_articles": quota}))
 
     # -------- Location News --------
     if query.get('location'):
-        location = query['location']
-        location_tasks = await asyncio.gather(
-            run_scraper("India TV (City)", india_tv_cities_scraper.india_tv_news_cities_scraper(location=location)),
-            run_scraper("NDTV (City)", ndtv_city_scraper.ndtv_cities_scraper(location=location)),
-            run_scraper("News18 (City)", news18city.news18_cities_scraper(location=location)),
-            run_scraper("Tribune India (City)", tribuneindiacity.tribune_city_scraper(location=location)),
-        )
-        for news in location_tasks:
-            raw_data.extend(news[:2])
+        for module in [india_tv_cities_scraper, ndtv_city_scraper, news18city, tribuneindiacity]:
+            sources.append((module.SPEC, {"max_articles": quota, "location": query['location']}))
 
     # -------- Topic News --------
     if query.get('topic'):
         topic = query['topic']
-        topic_tasks = await asyncio.gather(
-            run_scraper("Indian Express (Topic)", indianexpress.indian_express_topic_scraper(topics=topic)),
-            run_scraper("Livemint (Topic)", livemint.livemint_topic_scraper(topics=topic)),
-            run_scraper("News18 (Topic)", news18.news18_topic_scraper(topics=topic)),
-            run_scraper("Tribune India (Topic)", tribuneindia.tribune_topic_scraper(topics=topic)),
-        )
-        for news in topic_tasks:
-            raw_data.extend(news[:2])
+        # Topic scrapers fill their quota per topic, so split the source's quota across the topics
+        topic_quota = -(-quota // len(topic))
+        for module in [indianexpress, livemint, news18, tribuneindia]:
+            sources.append((module.SPEC, {"max_articles": topic_quota, "topics": topic}))
+
+    return sources
+
+
+# Main function to run all selected scrapers based on user query
+async def run_selected_scrapers(query: dict, budget: float = SCRAPE_BUDGET, first_k: int = SCRAPE_FIRST_K,
+                                ui_loop: asyncio.AbstractEventLoop = None) -> list:
+    """
+    Pulls articles from all selected scrapers as they arrive, up to ARTICLES_PER_SOURCE
+    from each, and labels every article in the background while the rest are still scraping.
+    Sources with an open circuit breaker are skipped, the others get a timeout derived
+    from their recent latency. With SCRAPER_JOB_QUEUE set the sources are scraped by
+    the scrape workers and their articles read back from the job queue.
+
+    Scraping stops after `budget` seconds, or once `first_k` articles with distinct
+    content have arrived, whichever comes first. The articles gathered so far are
+    returned and the sources still running are cancelled and reported as cut off.
+
+    Progress messages are sent on `ui_loop`, the chat's event loop, when the
+    scrapers run on another one.
+    """
+    raw_data = []
+    labels = []
+    cut_off = []
+    loop = asyncio.get_running_loop()
+    session = await HTTP_SESSION.get()
+    start = loop.time()
+
+    streams = {}
+    timeouts = {}
+    for spec, kwargs in selected_sources(query):
+        name = spec["name"]
+        if not allow(name):
+            await on_ui_loop(cl.Message(content=f"⏸️ `{name}` skipped, it kept failing recently.").send(), ui_loop)
+            continue
+        timeouts[name] = run_timeout(name, SCRAPER_TIMEOUT)
+        if JOB_QUEUE:
+            # Scraped by the workers, see scrape_worker.py
+            streams[name] = queued_stream(default_queue(), name, kwargs, ARTICLES_PER_SOURCE, timeouts[name])
+        else:
+            streams[name] = stream_site(spec, session=session, pool=BROWSER_POOL, **kwargs)
+
+    messages = await start_progress(list(streams), ui_loop)
+    timings = {}
+    on_finish = progress_reporter(messages, timeouts, cut_off, timings, ui_loop)
+    merged = merge_streams(streams, ARTICLES_PER_SOURCE, timeouts, on_finish=on_finish)
+
+    async def collect():
+        contents = set()
+        async for _, article in merged:
+            raw_data.append(article)
+            labels.append(loop.run_in_executor(LABEL_EXECUTOR, predict_category, str(article['content']).strip()))
+            contents.add(article['content'])
+            if first_k and len(contents) >= first_k:
+                break
+
+    try:
+        await asyncio.wait_for(collect(), budget or None)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        # Cancels the sources still running, closing their browser pages
+        await merged.aclose()
+
+    if cut_off:
+        elapsed = loop.time() - start
+        print(f"Deadline reached after {elapsed:.1f}s with {len(raw_data)} articles, cut off: {cut_off}")
+        await on_ui_loop(cl.Message(content=f"⏱️ Returning {len(raw_data)} articles after {elapsed:.1f}s, "
+                                            f"cut off: {', '.join(cut_off)}").send(), ui_loop)
+
+    # Articles whose labelling failed are labelled again in post_process_results
+    for article, label in zip(raw_data, await asyncio.gather(*labels, return_exceptions=True)):
+        article['news_label'] = None if isinstance(label, Exception) else label
 
+    print(f"Browser pool stats: {BROWSER_POOL.stats()}")
+    print(f"HTTP/browser fetch counts per source: {fallback_stats()}")
+    print(f"Fetched vs used article pages per source: {quota_stats()}")
+    print(f"Article store stats: {default_store().stats()}")
+    print(f"HTTP cache stats: {default_cache().stats()}")
+    print(f"Source health: {health_stats()}")
+    print(f"Selector misses per source: {selector_stats()}")
+    print(f"Browser requests blocked: {blocking_stats()}")
+    print(f"Rate limits per domain: {rate_limit_stats()}")
+    last_run.clear()
+    last_run.update(seconds=round(loop.time() - start, 2), articles=len(raw_data), sources=timings)
     return raw_data
 
 # Function to apply post-processing
@@ -100,8 +268,11 @@ def post_process_results(df: pd.DataFrame, query: dict) -> pd.DataFrame:
     df['date_time'] = df['date_time'].fillna("")
     df['date_time'] = df['date_time'].astype(str).apply(lambda x: x.replace('+05:30', '').strip() if isinstance(x, str) else x)
     
-    # Predict news categories
-    df["news_label"] = df["content"].apply(predict_category)
+    # Predict news categories, most were already labelled as they arrived
+    if 'news_label' not in df.columns:
+        df['news_label'] = None
+    unlabelled = df['news_label'].isna()
+    df.loc[unlabelled, 'news_label'] = df.loc[unlabelled, 'content'].apply(predict_category)
     df.to_csv('labelled_news_data.csv')
 
     # Initialize variables to track what we have
@@ -275,7 +446,7 @@ def post_process_results(df: pd.DataFrame, query: dict) -> pd.DataFrame:
 
 
 # Main function to handle the pipeline
-def scrape_and_process(args: dict, user_query: str) -> pd.DataFrame:
+async def scrape_and_process(args: dict, user_query: str) -> pd.DataFrame:
     latest_news = args.get('latest_news', False)
     topics = normalize_topic_param(args.get('topic'))
     locations = find_location_in_user_query(args, user_query)
@@ -284,8 +455,12 @@ def scrape_and_process(args: dict, user_query: str) -> pd.DataFrame:
     query = {"latest_news" : latest_news, "topic" : topics, "location" : locations, "language" : language}
     print(query)
 
-    # Call the scrapers and collect raw news data
-    raw_data = asyncio.run(run_selected_scrapers(query))
+    # Call the scrapers and collect raw news data, this loop stays free to send their progress messages
+    raw_data = await await_in_scraping_loop(run_selected_scrapers(query, ui_loop=asyncio.get_running_loop()))
+    if not raw_data:
+        # Every source failed, was skipped or missed the deadline
+        await cl.Message(content="📭 No articles arrived in time, please try again in a moment.").send()
+        return pd.DataFrame(columns=ARTICLE_COLUMNS)
     df = pd.DataFrame(raw_data)
     df = df.drop_duplicates(subset=['content'], keep='first').reset_index(drop=True)
     df.to_csv('raw_news_data.csv')
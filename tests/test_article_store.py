@@ -0,0 +1,18 @@
+from scrapers.article_store import canonical_url
+
+
+def test_canonical_url_drops_tracking_params_and_fragment():
+    assert canonical_url("HTTPS://WWW.NDTV.com/india-news/story-123?utm_source=x&b=2&a=1#top") == \
+        "https://www.ndtv.com/india-news/story-123?a=1&b=2"
+
+
+def test_canonical_url_maps_amp_pages_to_the_regular_one():
+    assert canonical_url("https://amp.livemint.com/news/story.html") == "https://livemint.com/news/story.html"
+    assert canonical_url("https://www.ndtv.com/india-news/story-123/amp/1") == "https://www.ndtv.com/india-news/story-123"
+    assert canonical_url("https://www.news18.com/amp/india/story-123.html") == "https://www.news18.com/india/story-123.html"
+
+
+def test_canonical_url_keeps_amp_in_slugs_of_other_sites():
+    assert canonical_url("https://www.livemint.com/news/amp-up-your-savings-11.html") == \
+        "https://www.livemint.com/news/amp-up-your-savings-11.html"
+    assert canonical_url("https://www.tribuneindia.com/news/amp/1") == "https://www.tribuneindia.com/news/amp/1"
@@ -0,0 +1,52 @@
+import asyncio
+from scrapers.fetch import single_flight
+
+
+def test_single_flight_shares_one_call():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "article"
+
+    async def main():
+        return await asyncio.gather(single_flight("key", fetch), single_flight("key", fetch))
+
+    assert asyncio.run(main()) == ["article", "article"]
+    assert len(calls) == 1
+
+
+def test_single_flight_keeps_running_for_remaining_waiters():
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return "article"
+
+    async def main():
+        first = asyncio.create_task(single_flight("key", fetch))
+        second = asyncio.create_task(single_flight("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "article"
+
+
+def test_single_flight_join_after_last_waiter_cancelled():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "article"
+
+    async def main():
+        first = asyncio.create_task(single_flight("key", fetch))
+        await asyncio.sleep(0)
+        # The last waiter leaves, cancelling the shared call, and a new caller arrives right after
+        first.cancel()
+        second = asyncio.create_task(single_flight("key", fetch))
+        return await second
+
+    assert asyncio.run(main()) == "article"
+    assert len(calls) == 2
@@ -0,0 +1,53 @@
+import asyncio
+import aiohttp
+from aiohttp import web
+from scrapers.http_cache import HttpCache
+
+
+async def serve_and_get(cache, path, fetches):
+    requests = []
+
+    async def page(request):
+        requests.append(dict(request.headers))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(text="<html>article</html>", content_type="text/html", headers={"ETag": '"v1"'})
+
+    app = web.Application()
+    app.router.add_get(path, page)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        async with aiohttp.ClientSession() as session:
+            results = [await cache.get(session, f"http://127.0.0.1:{port}{path}") for _ in range(fetches)]
+    finally:
+        await runner.cleanup()
+    return results, requests
+
+
+def test_unchanged_page_is_revalidated_with_its_etag(tmp_path):
+    cache = HttpCache(directory=str(tmp_path))
+    results, requests = asyncio.run(serve_and_get(cache, "/story", 2))
+
+    assert results == [(200, "<html>article</html>")] * 2
+    assert "If-None-Match" not in requests[0]
+    assert requests[1]["If-None-Match"] == '"v1"'
+    assert cache.stats()["misses"] == 1 and cache.stats()["revalidated"] == 1
+
+
+def test_fresh_entry_is_served_without_a_request(tmp_path):
+    cache = HttpCache(directory=str(tmp_path), default_ttl=60)
+    results, requests = asyncio.run(serve_and_get(cache, "/story", 2))
+
+    assert results == [(200, "<html>article</html>")] * 2
+    assert len(requests) == 1 and cache.stats()["hits"] == 1
+
+
+def test_disabled_cache_always_fetches(tmp_path):
+    cache = HttpCache(directory="")
+    _, requests = asyncio.run(serve_and_get(cache, "/story", 2))
+
+    assert len(requests) == 2 and "If-None-Match" not in requests[1]
@@ -0,0 +1,94 @@
+import time
+import asyncio
+import pytest
+from scrapers.job_queue import LEASE_SECONDS, SqliteJobQueue, queued_stream
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = SqliteJobQueue(str(tmp_path / "jobs.sqlite3"))
+    yield queue
+    queue.close()
+
+
+def expire_lease(queue, job_id):
+    with queue._lock:
+        queue._db.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time() - LEASE_SECONDS - 1, job_id))
+
+
+def test_claim_hands_out_each_job_once(queue):
+    job_id = queue.enqueue("NDTV", {"max_articles": 2}, limit=2, timeout=10)
+    job = queue.claim("worker-1")
+    assert job["id"] == job_id and job["kwargs"] == {"max_articles": 2}
+    assert queue.claim("worker-2") is None
+
+
+def test_expired_lease_is_reclaimed(queue):
+    job_id = queue.enqueue("NDTV", {})
+    queue.claim("worker-1")
+    queue.publish(job_id, {"content": "a"})
+    expire_lease(queue, job_id)
+
+    assert queue.claim("worker-2")["id"] == job_id
+    # The silent worker's results are kept for readers that already saw them
+    articles, status, _, _ = queue.results(job_id)
+    assert articles == [{"content": "a"}] and status == "running"
+
+
+def test_cancelled_job_stops_its_worker(queue):
+    job_id = queue.enqueue("NDTV", {})
+    queue.claim("worker-1")
+    assert queue.heartbeat(job_id)
+    queue.cancel(job_id)
+    assert not queue.heartbeat(job_id)
+
+
+def test_purged_job_reads_as_cancelled(queue):
+    assert queue.results("missing") == ([], "cancelled", None, [])
+
+
+def test_queued_stream_skips_articles_published_again_after_reclaim(queue):
+    async def main():
+        articles = []
+        stream = queued_stream(queue, "NDTV", {})
+
+        async def worker():
+            while (job := queue.claim("worker-1")) is None:
+                await asyncio.sleep(0.01)
+            queue.publish(job["id"], {"content": "a"})
+            queue.publish(job["id"], {"content": "b"})
+            await asyncio.sleep(0.5)
+            # The first worker went silent, the next one starts the job over
+            expire_lease(queue, job["id"])
+            job = queue.claim("worker-2")
+            for content in ["a", "b", "c"]:
+                queue.publish(job["id"], {"content": content})
+            queue.finish(job["id"])
+
+        task = asyncio.create_task(worker())
+        async for article in stream:
+            articles.append(article["content"])
+        await task
+        return articles
+
+    assert asyncio.run(main()) == ["a", "b", "c"]
+
+
+def test_queued_stream_records_the_worker_latencies(queue):
+    from scrapers.source_health import _sources
+
+    async def main():
+        async def worker():
+            while (job := queue.claim("worker-1")) is None:
+                await asyncio.sleep(0.01)
+            queue.heartbeat(job["id"], [0.5])
+            queue.publish(job["id"], {"content": "a"})
+            queue.finish(job["id"], latencies=[0.5, 0.7])
+
+        task = asyncio.create_task(worker())
+        articles = [article async for article in queued_stream(queue, "Queued source", {})]
+        await task
+        return articles
+
+    assert asyncio.run(main()) == [{"content": "a"}]
+    assert list(_sources["Queued source"].latencies) == [0.5, 0.7]
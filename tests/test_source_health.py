@@ -0,0 +1,54 @@
+import pytest
+from scrapers import source_health
+from scrapers.source_health import COOL_DOWN, FAILURE_THRESHOLD, allow, record_outcome, release_trial
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(source_health.time, "time", lambda: now[0])
+    yield now
+    source_health._sources.clear()
+
+
+def open_breaker(source):
+    for _ in range(FAILURE_THRESHOLD):
+        record_outcome(source, False)
+
+
+def test_breaker_opens_after_repeated_failures(clock):
+    open_breaker("A")
+    assert not allow("A")
+
+
+def test_half_open_admits_a_single_trial(clock):
+    open_breaker("A")
+    clock[0] += COOL_DOWN
+    assert allow("A")
+    assert not allow("A")
+    record_outcome("A", True)
+    assert allow("A") and allow("A")
+
+
+def test_failed_trial_reopens_the_breaker(clock):
+    open_breaker("A")
+    clock[0] += COOL_DOWN
+    assert allow("A")
+    record_outcome("A", False)
+    assert not allow("A")
+
+
+def test_released_trial_lets_the_next_caller_through(clock):
+    open_breaker("A")
+    clock[0] += COOL_DOWN
+    assert allow("A")
+    release_trial("A")
+    assert allow("A")
+
+
+def test_unreported_trial_expires_after_the_cool_down(clock):
+    open_breaker("A")
+    clock[0] += COOL_DOWN
+    assert allow("A")
+    clock[0] += COOL_DOWN
+    assert allow("A")